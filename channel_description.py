@@ -1,4 +1,5 @@
 import os
+from heapq import nsmallest
 
 from data_types import CategoryCriteria, Channel
 from settings import DATA_DIR
@@ -8,10 +9,13 @@ from utils import hour_float_to_hour_minute
 AI generated code
 """
 
+_GENRE_SENTINELS = frozenset({CategoryCriteria.GENRE, "genre", "GENRE", "Genre"})
+
+
 def _is_genre_category(cat) -> bool:
     """Vrai si la catégorie correspond à GENRE (gère Enum ou str)."""
-    if isinstance(cat, CategoryCriteria):
-        return cat == CategoryCriteria.GENRE
+    if isinstance(cat, str):  # couvre aussi CategoryCriteria (str, Enum)
+        return cat in _GENRE_SENTINELS or cat.lower() == "genre"
     return str(cat).lower() == "genre"
 
 
@@ -28,34 +32,44 @@ def print_channel_full_description(channel: Channel):
     blocks = channel.get("blocks", []) or []
     fillers = channel.get("fillers", []) or []
 
-    # ---- Stats sur les blocks / shows (ignore les available_*)
+    # ---- Stats sur les blocks / shows / genres en une seule passe (ignore les available_*)
     block_count = len(blocks)
-    total_block_duration = sum((b.get("end", 0) - b.get("begin", 0)) for b in blocks) if block_count else 0.0
-    avg_block_duration = (total_block_duration / block_count) if block_count else 0.0
-
-    blocks_without_shows = sum(1 for b in blocks if not b.get("shows"))
-    total_shows = sum(len(b.get("shows", [])) for b in blocks)
-    unique_show_names = {
-        s.get("name") for b in blocks for s in (b.get("shows") or []) if s.get("name")
-    }
-
-    # Diversité des slot_duration rencontrées (côté blocks uniquement)
-    slot_durations_seen = {
-        b.get("slot_format", {}).get("slot_duration")
-        for b in blocks
-        if isinstance(b.get("slot_format", {}), dict) and b["slot_format"].get("slot_duration") is not None
-    }
-    slot_durations_seen.discard(None)
-    slot_duration_min = min(slot_durations_seen) if slot_durations_seen else None
-    slot_duration_max = max(slot_durations_seen) if slot_durations_seen else None
+    total_block_duration = 0.0
+    blocks_without_shows = 0
+    total_shows = 0
+    unique_show_names = set()
+    slot_durations_seen = set()  # diversité des slot_duration rencontrées (côté blocks uniquement)
+    all_genres = set()  # tous les GENRE depuis les CRITERIA des blocks
+    add_show_name = unique_show_names.add
+    add_slot_duration = slot_durations_seen.add
+    add_genre = all_genres.add
 
-    # ---- Agrégation de tous les GENRE depuis les CRITERIA des blocks
-    all_genres = set()
     for b in blocks:
+        total_block_duration += b.get("end", 0) - b.get("begin", 0)
+
+        shows = b.get("shows") or []
+        if not shows:
+            blocks_without_shows += 1
+        total_shows += len(shows)
+        for s in shows:
+            show_name = s.get("name")
+            if show_name:
+                add_show_name(show_name)
+
+        slot_format = b.get("slot_format", {})
+        if isinstance(slot_format, dict):
+            slot_duration = slot_format.get("slot_duration")
+            if slot_duration is not None:
+                add_slot_duration(slot_duration)
+
         for crit in (b.get("criteria") or []):
             if _is_genre_category(crit.get("category")):
                 for g in (crit.get("values") or []):
-                    all_genres.add(str(g))
+                    add_genre(str(g))
+
+    avg_block_duration = (total_block_duration / block_count) if block_count else 0.0
+    slot_duration_min = min(slot_durations_seen) if slot_durations_seen else None
+    slot_duration_max = max(slot_durations_seen) if slot_durations_seen else None
 
     # ---- Impression du résumé
     print(f"📺 Chaîne : {name}")
@@ -80,7 +94,7 @@ def print_channel_full_description(channel: Channel):
     print(f" - Nombre total d’émissions listées : {total_shows}")
     print(f" - Nombre d’émissions uniques : {len(unique_show_names)}")
     if unique_show_names:
-        preview = sorted(unique_show_names)[:5]
+        preview = nsmallest(5, unique_show_names)
         print(f" - Aperçu (5 max) : {', '.join(preview)}")
     print()
 
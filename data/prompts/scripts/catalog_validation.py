@@ -3,11 +3,26 @@
 Validator for TV catalog specification (Category A checks).
 CLI usage:
   python validator_catalogue_tv.py <catalog.json>
+Compilation optionnelle (module entièrement annoté) :
+  mypyc --ignore-missing-imports catalog_validation.py
 """
 
 import json
 import sys
-from typing import Any, Dict, List
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import ijson  # optionnel : lecture du catalogue en flux, chaîne par chaîne
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # optionnel : parseur JSON en C, bien plus rapide que json
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 ALLOWED_SLOT_FORMATS = [
     {"show_min_duration": 22, "show_max_duration": 26, "slot_duration": 30},
@@ -17,11 +32,15 @@ ALLOWED_SLOT_FORMATS = [
     {"show_min_duration": 12, "show_max_duration": 13, "slot_duration": 15},
 ]
 
-ALLOWED_TYPES = {"series", "movie"}
+ALLOWED_TYPES = frozenset({"series", "movie"})
+_ALLOWED_TYPES_SORTED = sorted(ALLOWED_TYPES)
 
-ALLOWED_CRITERIA_CATEGORIES = {"genre", "type", "language", "duration"}
+# chaînes internées : les catégories lues dans le JSON le sont aussi (cf. validate_criterion),
+# la comparaison se réduit alors à un test d'identité
+ALLOWED_CRITERIA_CATEGORIES = frozenset(map(sys.intern, ("genre", "type", "language", "duration")))
+_ALLOWED_CATEGORIES_SORTED = sorted(ALLOWED_CRITERIA_CATEGORIES)  # listes affichées dans les messages
 
-# Genres normalisés (clés seulement)
+# Genres normalisés et leurs synonymes acceptés
 GENRES_NORMALISES = {
   "Podcast": ["Podcast"],
   "Animation": ["Animation", "Anime"],
@@ -49,189 +68,309 @@ GENRES_NORMALISES = {
   "YouTube": ["YouTube"]
 }
 
-GENRE_KEYS = set(GENRES_NORMALISES.keys())
+GENRE_KEYS = frozenset(map(sys.intern, GENRES_NORMALISES.keys()))
+
+# synonyme (ou clé) -> clé normalisée : accepte toute orthographe listée, en O(1)
+_SYNONYM_MAP = {
+    sys.intern(syn): sys.intern(canon) for canon, syns in GENRES_NORMALISES.items() for syn in (canon, *syns)
+}
+
+# Formats autorisés sous forme de tuples (min, max, slot) pour un test d'appartenance O(1)
+_ALLOWED_SF_SET = frozenset(
+    (x["show_min_duration"], x["show_max_duration"], x["slot_duration"])
+    for x in ALLOWED_SLOT_FORMATS
+)
+
+# clés obligatoires (tuple pour l'ordre des messages, frozenset pour le test global en C)
+_CHANNEL_KEYS = ("name", "description", "begin", "end", "fillers", "blocks")
+_CHANNEL_KEYS_SET = frozenset(_CHANNEL_KEYS)
+_BLOCK_KEYS = ("criteria", "begin", "end", "slot_count", "slot_format", "shows")
+_BLOCK_KEYS_SET = frozenset(_BLOCK_KEYS)
 
 def almost_equal(a: float, b: float, tol: float = 1e-6) -> bool:
     return abs(a - b) <= tol
 
+@lru_cache(maxsize=None)
+def _sf_ok(tmin: Any, tmax: Any, sd: Any) -> bool:
+    return (tmin, tmax, sd) in _ALLOWED_SF_SET
+
 def is_allowed_slot_format(sf: Dict[str, Any]) -> bool:
-    return any(
-        sf.get("show_min_duration") == x["show_min_duration"]
-        and sf.get("show_max_duration") == x["show_max_duration"]
-        and sf.get("slot_duration") == x["slot_duration"]
-        for x in ALLOWED_SLOT_FORMATS
-    )
+    try:
+        return _sf_ok(sf.get("show_min_duration"), sf.get("show_max_duration"), sf.get("slot_duration"))
+    except TypeError:
+        # valeurs non hashables (listes, dicts...) : forcément hors des formats autorisés
+        return False
 
 def validate_catalog_struct(catalog: Dict[str, Any]) -> List[str]:
-    errs = []
+    errs: List[str] = []
+    _err = errs.append
     for key in ("name", "step", "channels"):
         if key not in catalog:
-            errs.append(f"[catalog] clé manquante: {key}")
+            _err(f"[catalog] clé manquante: {key}")
     if "channels" in catalog and not isinstance(catalog["channels"], list):
-        errs.append("[catalog] 'channels' doit être une liste")
+        _err("[catalog] 'channels' doit être une liste")
     return errs
 
-def validate_channel(channel: Dict[str, Any], idx: int) -> List[str]:
-    errs = []
+def validate_channel(channel: Dict[str, Any], idx: int) -> Iterator[str]:
     prefix = f"[channel#{idx}:{channel.get('name','?')}]"
-    required = ("name", "description", "begin", "end", "fillers", "blocks")
-    for k in required:
-        if k not in channel:
-            errs.append(f"{prefix} clé manquante: {k}")
+    if not channel.keys() >= _CHANNEL_KEYS_SET:
+        for k in _CHANNEL_KEYS:
+            if k not in channel:
+                yield f"{prefix} clé manquante: {k}"
     # types de base
+    begin: Optional[float]
+    end: Optional[float]
     try:
         begin = float(channel.get("begin", 0))
         end = float(channel.get("end", 0))
         if not (begin < end):
-            errs.append(f"{prefix} begin < end requis (begin={begin}, end={end})")
+            yield f"{prefix} begin < end requis (begin={begin}, end={end})"
     except Exception:
-        errs.append(f"{prefix} begin/end doivent être numériques")
+        yield f"{prefix} begin/end doivent être numériques"
         begin = None
         end = None
 
     # fillers
     fillers = channel.get("fillers", [])
     if not isinstance(fillers, list):
-        errs.append(f"{prefix} 'fillers' doit être une liste")
+        yield f"{prefix} 'fillers' doit être une liste"
     else:
         for g in fillers:
-            if g not in GENRE_KEYS:
-                errs.append(f"{prefix} filler genre inconnu (clé normalisée requise): {g}")
+            if g not in _SYNONYM_MAP:
+                yield f"{prefix} filler genre inconnu (clé normalisée ou synonyme requis): {g}"
 
     # blocks
     blocks = channel.get("blocks", [])
     if not isinstance(blocks, list) or len(blocks) == 0:
-        errs.append(f"{prefix} 'blocks' doit être une liste non vide")
-        return errs  # can't continue
+        yield f"{prefix} 'blocks' doit être une liste non vide"
+        return  # can't continue
 
-    # tri et continuité sans trous
+    # tri et continuité sans trous : begin converti une seule fois, tri sur la valeur pré-calculée
     try:
-        blocks_sorted = sorted(blocks, key=lambda b: float(b["begin"]))
+        parsed: List[Tuple[float, Dict[str, Any]]] = [(float(b["begin"]), b) for b in blocks]
     except Exception:
-        errs.append(f"{prefix} impossible de trier les blocs par 'begin' (valeurs numériques requises)")
-        return errs
+        yield f"{prefix} impossible de trier les blocs par 'begin' (valeurs numériques requises)"
+        return
+    parsed.sort(key=itemgetter(0))
+    begins: List[float] = [b_begin for b_begin, _ in parsed]
+    ends: Optional[List[float]] = None
 
     # vérif premier/dernier et chainage
     if begin is not None and end is not None:
-        first_begin = float(blocks_sorted[0]["begin"])
-        last_end = float(blocks_sorted[-1]["end"])
+        # end de chaque bloc converti une seule fois, puis comparé par paires
+        ends = [float(b["end"]) for _, b in parsed]
+        first_begin = begins[0]
+        last_end = ends[-1]
         if not almost_equal(first_begin, begin):
-            errs.append(f"{prefix} le 1er bloc doit commencer à 'begin' (attendu {begin}, reçu {first_begin})")
+            yield f"{prefix} le 1er bloc doit commencer à 'begin' (attendu {begin}, reçu {first_begin})"
         if not almost_equal(last_end, end):
-            errs.append(f"{prefix} le dernier bloc doit finir à 'end' (attendu {end}, reçu {last_end})")
+            yield f"{prefix} le dernier bloc doit finir à 'end' (attendu {end}, reçu {last_end})"
 
-        for i in range(len(blocks_sorted) - 1):
-            cur_end = float(blocks_sorted[i]["end"])
-            nxt_begin = float(blocks_sorted[i+1]["begin"])
-            if cur_end > nxt_begin + 1e-6:
-                errs.append(f"{prefix} chevauchement blocs {i} et {i+1} (end {cur_end} > begin {nxt_begin})")
-            if not almost_equal(cur_end, nxt_begin):
-                errs.append(f"{prefix} trou entre blocs {i} et {i+1} (end {cur_end} != begin {nxt_begin})")
+        # écart calculé une fois par paire, comparé directement à la tolérance (sans appel de fonction)
+        for i, (cur_end, nxt_begin) in enumerate(zip(ends, begins[1:])):
+            diff = cur_end - nxt_begin
+            if diff > 1e-6:
+                yield f"{prefix} chevauchement blocs {i} et {i+1} (end {cur_end} > begin {nxt_begin})"
+            if not -1e-6 <= diff <= 1e-6:
+                yield f"{prefix} trou entre blocs {i} et {i+1} (end {cur_end} != begin {nxt_begin})"
 
         # aucun bloc ne doit sortir de la plage globale
-        for j, b in enumerate(blocks_sorted):
-            b_begin = float(b["begin"])
-            b_end = float(b["end"])
+        for j, (b_begin, b_end) in enumerate(zip(begins, ends)):
             if b_begin < begin - 1e-6 or b_end > end + 1e-6:
-                errs.append(f"{prefix} bloc#{j} hors de la plage chaîne (block [{b_begin},{b_end}] vs [{begin},{end}])")
+                yield f"{prefix} bloc#{j} hors de la plage chaîne (block [{b_begin},{b_end}] vs [{begin},{end}])"
 
     # valider chaque bloc
-    for j, b in enumerate(blocks_sorted):
-        errs.extend(validate_block(b, f"{prefix}[block#{j}]"))
-    return errs
+    for j, (b_begin, b) in enumerate(parsed):
+        block_end = ends[j] if ends is not None else None
+        yield from validate_block(b, f"{prefix}[block#{j}]", _begin=b_begin, _end=block_end)
 
-def validate_block(block: Dict[str, Any], prefix: str) -> List[str]:
-    errs = []
-    for k in ("criteria", "begin", "end", "slot_count", "slot_format", "shows"):
-        if k not in block:
-            errs.append(f"{prefix} clé manquante: {k}")
+def validate_block(block: Dict[str, Any], prefix: str,
+                   _begin: Optional[float] = None, _end: Optional[float] = None) -> Iterator[str]:
+    if not block.keys() >= _BLOCK_KEYS_SET:
+        for key in _BLOCK_KEYS:
+            if key not in block:
+                yield f"{prefix} clé manquante: {key}"
+    # _begin/_end : valeurs déjà converties par validate_channel
+    begin: Optional[float]
+    end: Optional[float]
     try:
-        begin = float(block.get("begin", 0))
-        end = float(block.get("end", 0))
+        begin = float(block.get("begin", 0)) if _begin is None else _begin
+        end = float(block.get("end", 0)) if _end is None else _end
         if not (begin < end):
-            errs.append(f"{prefix} begin < end requis (begin={begin}, end={end})")
+            yield f"{prefix} begin < end requis (begin={begin}, end={end})"
     except Exception:
-        errs.append(f"{prefix} begin/end doivent être numériques")
+        yield f"{prefix} begin/end doivent être numériques"
         begin = None
         end = None
 
     # slot_count
     slot_count = block.get("slot_count")
     if slot_count not in (1, 2):
-        errs.append(f"{prefix} slot_count doit être 1 ou 2 (reçu {slot_count})")
+        yield f"{prefix} slot_count doit être 1 ou 2 (reçu {slot_count})"
 
     # slot_format
     sf = block.get("slot_format", {})
-    if not isinstance(sf, dict) or not is_allowed_slot_format(sf):
-        errs.append(f"{prefix} slot_format non autorisé ou invalide: {sf}")
+    sf_is_dict = type(sf) is dict
+    if not sf_is_dict or not is_allowed_slot_format(sf):
+        yield f"{prefix} slot_format non autorisé ou invalide: {sf}"
 
     # durée du bloc
-    if isinstance(sf, dict) and begin is not None and end is not None and isinstance(slot_count, int):
+    if sf_is_dict and begin is not None and end is not None and isinstance(slot_count, int):
         expected_hours = (sf.get("slot_duration", 0) * slot_count) / 60.0
         actual_hours = end - begin
         if not almost_equal(expected_hours, actual_hours):
-            errs.append(f"{prefix} durée bloc {actual_hours}h ≠ {expected_hours}h attendu (slot_duration*slot_count)")
+            yield f"{prefix} durée bloc {actual_hours}h ≠ {expected_hours}h attendu (slot_duration*slot_count)"
 
     # criteria
     criteria = block.get("criteria", [])
     if not isinstance(criteria, list) or len(criteria) == 0:
-        errs.append(f"{prefix} criteria doit être une liste non vide")
+        yield f"{prefix} criteria doit être une liste non vide"
     else:
         for k, crit in enumerate(criteria):
-            errs.extend(validate_criterion(crit, f"{prefix}[criteria#{k}]"))
+            yield from validate_criterion(crit, f"{prefix}[criteria#{k}]")
 
     # shows
     if "shows" not in block:
-        errs.append(f"{prefix} 'shows' manquant")
+        yield f"{prefix} 'shows' manquant"
     elif not isinstance(block["shows"], list):
-        errs.append(f"{prefix} 'shows' doit être une liste")
+        yield f"{prefix} 'shows' doit être une liste"
 
-    return errs
+# Les validateurs comparent type(x) aux types exacts plutôt que d'appeler isinstance :
+# les décodeurs JSON ne produisent que des types natifs (bool reste accepté comme nombre).
+def _check_genre(v: Any) -> Optional[str]:
+    if v not in _SYNONYM_MAP:
+        return f"genre inconnu (clé normalisée ou synonyme requis): {v}"
+    return None
 
-def validate_criterion(crit: Dict[str, Any], prefix: str) -> List[str]:
-    errs = []
-    cat = crit.get("category")
+def _check_type(v: Any) -> Optional[str]:
+    if v not in ALLOWED_TYPES:
+        return f"type invalide: {v} (attendu {_ALLOWED_TYPES_SORTED})"
+    return None
+
+def _check_language(v: Any) -> Optional[str]:
+    if type(v) is not str:
+        return f"language doit être string (reçu {type(v).__name__})"
+    return None
+
+def _check_duration(v: Any) -> Optional[str]:
+    t = type(v)
+    if t is not int and t is not float and t is not bool:
+        return f"duration doit être numérique en minutes (reçu {t.__name__})"
+    if v <= 0:
+        return f"duration doit être > 0 (reçu {v})"
+    return None
+
+# catégorie -> validateur d'une valeur (renvoie le message d'erreur ou None)
+_CAT_VALIDATORS = {
+    "genre": _check_genre,
+    "type": _check_type,
+    "language": _check_language,
+    "duration": _check_duration,
+}
+
+# catégories dont les valeurs sont restreintes à un ensemble fermé
+_CAT_ALLOWED_VALUES = {
+    "genre": _SYNONYM_MAP.keys(),
+    "type": ALLOWED_TYPES,
+}
+
+# cache des messages (sans préfixe) par critère : les mêmes critères se répètent d'un bloc à l'autre
+_CRIT_CACHE: Dict[Tuple[Any, ...], Tuple[str, ...]] = {}
+
+def _criterion_errors(cat: Any, forbidden: Any, values: Any) -> List[str]:
+    errs: List[str] = []
+    _err = errs.append
     if cat not in ALLOWED_CRITERIA_CATEGORIES:
-        errs.append(f"{prefix} category invalide: {cat} (attendu {sorted(ALLOWED_CRITERIA_CATEGORIES)})")
+        _err(f"category invalide: {cat} (attendu {_ALLOWED_CATEGORIES_SORTED})")
 
     # forbidden bool
-    forbidden = crit.get("forbidden")
-    if not isinstance(forbidden, bool):
-        errs.append(f"{prefix} 'forbidden' doit être booléen (True/False)")
+    if type(forbidden) is not bool:
+        _err("'forbidden' doit être booléen (True/False)")
 
     # values list checks
-    values = crit.get("values")
-    if not isinstance(values, list) or len(values) == 0:
-        errs.append(f"{prefix} 'values' doit être une liste non vide")
+    if type(values) is not list or len(values) == 0:
+        _err("'values' doit être une liste non vide")
     else:
-        # validation par catégorie
-        if cat == "genre":
-            for v in values:
-                if v not in GENRE_KEYS:
-                    errs.append(f"{prefix} genre inconnu (clé normalisée requise): {v}")
-        elif cat == "type":
-            for v in values:
-                if v not in ALLOWED_TYPES:
-                    errs.append(f"{prefix} type invalide: {v} (attendu {sorted(ALLOWED_TYPES)})")
-        elif cat == "language":
+        # validation par catégorie (table de dispatch construite à l'import)
+        check = _CAT_VALIDATORS.get(cat)
+        allowed = _CAT_ALLOWED_VALUES.get(cat)
+        if check is not None and allowed is not None:
+            # genre/type : valeurs non textuelles (éventuellement non hashables) écartées, puis
+            # différence d'ensembles en un seul appel ; messages formatés pour les seuls rejets
+            strings = [v for v in values if type(v) is str]
+            bad = set(strings).difference(allowed)
+            if bad or len(strings) != len(values):
+                for v in values:
+                    if type(v) is not str:
+                        _err(f"{cat} doit être string (reçu {type(v).__name__})")
+                    elif v in bad:
+                        msg = check(v)
+                        if msg:
+                            _err(msg)
+        elif check is not None:
             for v in values:
-                if not isinstance(v, str):
-                    errs.append(f"{prefix} language doit être string (reçu {type(v).__name__})")
-        elif cat == "duration":
-            for v in values:
-                if not isinstance(v, (int, float)):
-                    errs.append(f"{prefix} duration doit être numérique en minutes (reçu {type(v).__name__})")
-                elif v <= 0:
-                    errs.append(f"{prefix} duration doit être > 0 (reçu {v})")
+                msg = check(v)
+                if msg:
+                    _err(msg)
     return errs
 
+def validate_criterion(crit: Dict[str, Any], prefix: str) -> Iterator[str]:
+    cat = crit.get("category")
+    if type(cat) is str:
+        cat = sys.intern(cat)
+    forbidden = crit.get("forbidden")
+    values = crit.get("values")
+    # les types font partie de la clé : 1, 1.0 et True sont égaux mais ne donnent pas les mêmes erreurs
+    key = None
+    if isinstance(values, list):
+        key = (type(cat), cat, type(forbidden), forbidden, tuple((type(v), v) for v in values))
+    try:
+        msgs = _CRIT_CACHE.get(key) if key is not None else None
+    except TypeError:
+        # valeur non hashable : pas de mise en cache
+        key = None
+        msgs = None
+    if msgs is None:
+        msgs = tuple(_criterion_errors(cat, forbidden, values))
+        if key is not None:
+            _CRIT_CACHE[key] = msgs
+    for m in msgs:
+        yield f"{prefix} {m}"
+
 def validate_catalog(catalog: Dict[str, Any]) -> List[str]:
     errors: List[str] = []
     errors.extend(validate_catalog_struct(catalog))
     channels = catalog.get("channels", []) if isinstance(catalog, dict) else []
     if isinstance(channels, list):
-        for i, ch in enumerate(channels):
-            errors.extend(validate_channel(ch, i))
+        errors.extend(chain.from_iterable(validate_channel(ch, i) for i, ch in enumerate(channels)))
+    return errors
+
+def load_catalog(path: str) -> Any:
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def validate_catalog_file(path: str) -> List[str]:
+    """Valide un fichier catalogue sans le charger entièrement (nécessite ijson).
+
+    Une première lecture ne relève que les clés de premier niveau, une seconde
+    valide les chaînes une par une : le pic mémoire est celui d'une chaîne.
+    """
+    with open(path, "rb") as f:
+        # structure du catalogue : clés présentes et type de 'channels'
+        stub: Dict[str, Any] = {}
+        for prefix, event, value in ijson.parse(f):
+            if prefix == "" and event == "map_key":
+                stub[value] = None
+            elif prefix == "channels" and event == "start_array" and stub.get("channels") is None:
+                stub["channels"] = []
+        errors = validate_catalog_struct(stub)
+        if isinstance(stub.get("channels"), list):
+            f.seek(0)
+            for i, ch in enumerate(ijson.items(f, "channels.item", use_float=True)):
+                errors.extend(validate_channel(ch, i))
     return errors
 
 def main(argv: List[str]) -> int:
@@ -239,9 +378,10 @@ def main(argv: List[str]) -> int:
         print("Usage: python validator_catalogue_tv.py <catalog.json>", file=sys.stderr)
         return 2
     path = argv[1]
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    errs = validate_catalog(data)
+    if ijson is not None:
+        errs = validate_catalog_file(path)
+    else:
+        errs = validate_catalog(load_catalog(path))
     if not errs:
         print("✅ Catalogue valide (règles catégorie A).")
         return 0
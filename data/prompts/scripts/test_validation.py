@@ -19,11 +19,17 @@ vérifier que la logique principale fonctionne. Dans un cadre réel, il serait
 préférable d'utiliser un framework de test unitaire tel que `pytest`.
 """
 
+import io
 import json
+import os
+import tempfile
+from contextlib import redirect_stdout
 from pprint import pprint
 
+from catalog_validation import validate_catalog
 from validate_json_structure import validate_catalog_structure
-from validate_catalog_rules import validate_catalog_rules
+from validate_catalog_rules import main as rules_main
+from validate_catalog_rules import validate_catalog_rules, validate_criterion_rules
 
 
 def example_valid_catalog() -> dict:
@@ -169,6 +175,75 @@ def run_tests() -> None:
     pprint(rule_errs2)
     assert struct_errs2 or rule_errs2, "Le catalogue invalide doit présenter des erreurs"
     print("→ OK")
+    print()
+    print("Test 3 : slot_count flottant")
+    cat_float = example_valid_catalog()
+    cat_float["channels"][0]["blocks"][0]["slot_count"] = 2.0
+    struct_errs3 = validate_catalog_structure(cat_float)
+    rule_errs3 = validate_catalog_rules(cat_float)
+    pprint(struct_errs3)
+    # le chemin rapide (schéma) ne doit rien accepter que le parcours détaillé refuse
+    assert any("'slot_count' doit être un entier" in e for e in struct_errs3)
+    assert any("'slot_count' doit être un entier" in e for e in rule_errs3)
+    print("→ OK")
+    print()
+    print("Test 4 : chevauchement signalé une seule fois")
+    pair_errs = [e for e in rule_errs2 if "blocs 0 et 1" in e]
+    pprint(pair_errs)
+    # un chevauchement n'est pas aussi rapporté comme trou
+    assert len(pair_errs) == 1 and "chevauchement" in pair_errs[0]
+    print("→ OK")
+    print()
+    print("Test 5 : synonymes de genres acceptés")
+    cat_syn = example_valid_catalog()
+    cat_syn["channels"][0]["fillers"] = ["Thriller"]
+    cat_syn["channels"][0]["blocks"][0]["criteria"][0]["values"] = ["Drama"]
+    syn_errs = validate_catalog(cat_syn)
+    pprint(syn_errs)
+    assert not syn_errs, "Un synonyme listé doit être accepté comme son genre normalisé"
+    # les trois validateurs s'accordent sur ce catalogue
+    assert not validate_catalog_structure(cat_syn)
+    assert not validate_catalog_rules(cat_syn)
+    print("→ OK")
+    print()
+    print("Test 6 : catégorie inconnue")
+    crit_errs = validate_criterion_rules({"category": "mood", "values": [], "forbidden": "non"}, "[crit]")
+    pprint(crit_errs)
+    # seule l'erreur de catégorie est rapportée, pas les erreurs en cascade
+    assert len(crit_errs) == 1 and "category invalide" in crit_errs[0]
+    print("→ OK")
+    print()
+    print("Test 7 : fail_fast")
+    first_err = validate_catalog_rules(cat_bad, fail_fast=True)
+    pprint(first_err)
+    assert first_err == rule_errs2[:1], "fail_fast doit renvoyer la première erreur de la validation complète"
+    assert validate_catalog_rules(cat, fail_fast=True) == []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(cat_bad, f, ensure_ascii=False)
+        out = io.StringIO()
+        with redirect_stdout(out):
+            code = rules_main(["validate_catalog_rules.py", path, "--fail-fast"])
+    assert code == 1
+    assert out.getvalue().count("\n- ") == 1, "--fail-fast ne doit afficher qu'une erreur"
+    print("→ OK")
+    print()
+    print("Test 8 : valeurs non textuelles dans un critère")
+    cat_odd = example_valid_catalog()
+    criteria = cat_odd["channels"][0]["blocks"][0]["criteria"]
+    criteria[0]["values"] = ["Suspense", {"nom": "Action"}]
+    criteria[1]["values"] = [["series"]]
+    odd_errs = validate_catalog_rules(cat_odd)
+    pprint(odd_errs)
+    # signalées comme erreurs, sans TypeError sur les valeurs non hashables
+    assert any("genre doit être une chaîne (reçu dict)" in e for e in odd_errs)
+    assert any("type doit être une chaîne (reçu list)" in e for e in odd_errs)
+    odd_errs_a = validate_catalog(cat_odd)
+    pprint(odd_errs_a)
+    assert any("genre doit être string (reçu dict)" in e for e in odd_errs_a)
+    assert any("type doit être string (reçu list)" in e for e in odd_errs_a)
+    print("→ OK")
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -19,17 +19,27 @@ sinon il listera toutes les erreurs relevées. Les fonctions de validation
 sont également exportées pour être utilisées dans des tests unitaires ou
 depuis un autre module.
 
+Les deux modules de validation sont entièrement annotés et peuvent être
+compilés en extensions C, sans changement d'API :
+
+    mypyc --ignore-missing-imports validate_catalog_rules.py validate_json_structure.py
+
 """
 
 from __future__ import annotations
 
 import json
 import sys
-from typing import Any, Dict, List
+from functools import partial
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from validate_json_structure import (
     validate_catalog_structure,
-    GENRES_NORMALISES_KEYS,
+    walk_catalog,
+    load_json,
+    StopValidation,
+    GENRES_ACCEPTES,
 )
 
 # Définition des formats de slot autorisés. Chaque élément est un dict
@@ -43,11 +53,21 @@ ALLOWED_SLOT_FORMATS = [
     {"show_min_duration": 12, "show_max_duration": 13, "slot_duration": 15},
 ]
 
+# Même table sous forme de tuples (show_min_duration, show_max_duration,
+# slot_duration) : un slot_format se valide alors par une seule recherche
+# dans un ensemble.
+_ALLOWED_SF_SET = frozenset(
+    (x["show_min_duration"], x["show_max_duration"], x["slot_duration"])
+    for x in ALLOWED_SLOT_FORMATS
+)
+
 # Types autorisés pour les shows (§6)
-ALLOWED_TYPES = {"series", "movie"}
+ALLOWED_TYPES = frozenset({"series", "movie"})
+_ALLOWED_TYPES_SORTED = sorted(ALLOWED_TYPES)  # pour les messages d'erreurs
 
 # Catégories autorisées pour les critères (§4)
-ALLOWED_CRITERIA_CATEGORIES = {"genre", "type", "language", "duration"}
+ALLOWED_CRITERIA_CATEGORIES = frozenset({"genre", "type", "language", "duration"})
+_ALLOWED_CATEGORIES_SORTED = sorted(ALLOWED_CRITERIA_CATEGORIES)
 
 
 def almost_equal(a: float, b: float, tol: float = 1e-6) -> bool:
@@ -67,6 +87,56 @@ def almost_equal(a: float, b: float, tol: float = 1e-6) -> bool:
     return abs(a - b) <= tol
 
 
+class _Prefix:
+    """Préfixe de message d'erreur construit paresseusement.
+
+    Sur un catalogue valide aucun message n'est produit : inutile donc de
+    formater ``[channel#i:nom][block#j][criteria#k]`` pour chaque chaîne, bloc
+    et critère. Les morceaux sont conservés tels quels et assemblés à la
+    première utilisation dans une f-string (via ``__format__``), puis mis en
+    cache.
+    """
+
+    __slots__ = ("_parts", "_text")
+
+    def __init__(self, *parts: Any) -> None:
+        self._parts = parts
+        self._text: Optional[str] = None
+
+    def __format__(self, spec: str) -> str:
+        text = self._text
+        if text is None:
+            text = self._text = "".join([format(p) for p in self._parts])
+        return format(text, spec)
+
+    def __str__(self) -> str:
+        return self.__format__("")
+
+
+def _num(d: Dict[str, Any], key: str) -> Optional[float]:
+    """Convertit ``d[key]`` (0 par défaut) en float, ou None si impossible.
+
+    Les flottants, cas nominal d'un catalogue structurellement valide, sont
+    renvoyés tels quels ; les autres valeurs passent par ``float()`` comme
+    auparavant, une erreur de conversion donnant None.
+
+    Args:
+        d: Dictionnaire source (chaîne, bloc ou slot_format).
+        key: Clé à lire.
+
+    Returns:
+        La valeur convertie en float, ou None si la conversion échoue.
+    """
+    v = d.get(key, 0)
+    if type(v) is float:
+        return v
+    # int (y compris très grands, qui débordent) et chaînes numériques
+    try:
+        return float(v)
+    except Exception:
+        return None
+
+
 def is_allowed_slot_format(sf: Dict[str, Any]) -> bool:
     """Indique si un slot_format est parmi les formats autorisés.
 
@@ -77,42 +147,46 @@ def is_allowed_slot_format(sf: Dict[str, Any]) -> bool:
     Returns:
         True si un format identique est défini dans ALLOWED_SLOT_FORMATS.
     """
-    return any(
-        sf.get("show_min_duration") == x["show_min_duration"]
-        and sf.get("show_max_duration") == x["show_max_duration"]
-        and sf.get("slot_duration") == x["slot_duration"]
-        for x in ALLOWED_SLOT_FORMATS
-    )
+    key = (sf.get("show_min_duration"), sf.get("show_max_duration"), sf.get("slot_duration"))
+    try:
+        return key in _ALLOWED_SF_SET
+    except TypeError:
+        # Valeurs non hashables (listes, objets) : aucun format ne peut correspondre
+        return False
 
 
-def validate_catalog_rules(catalog: Dict[str, Any]) -> List[str]:
+def validate_catalog_rules(catalog: Dict[str, Any], fail_fast: bool = False) -> List[str]:
     """Valide les règles métier du catalogue.
 
-    Cette fonction commence par valider la structure de l'objet via
-    :func:`validate_catalog_structure`. Ensuite, pour chaque chaîne, elle
-    valide la cohérence des horaires et des blocs et enfin vérifie les
-    critères. Les erreurs de structure et de règles sont concatenées.
+    Cette fonction valide la structure de l'objet (comme
+    :func:`validate_catalog_structure`) et, au cours du même parcours via
+    :func:`walk_catalog`, la cohérence des horaires, des blocs et des
+    critères de chaque chaîne. Les erreurs de structure et de règles sont
+    concatenées.
 
     Args:
         catalog: Dictionnaire représentant le catalogue.
+        fail_fast: Si vrai, la validation s'arrête à la première erreur
+            rencontrée, qui est alors la seule renvoyée. Suffisant quand seul
+            le verdict (valide ou non) importe.
 
     Returns:
         Une liste de messages d'erreurs. Vide si aucune erreur.
     """
-    errors: List[str] = []
-    # Première étape : valider la structure.
-    errors.extend(validate_catalog_structure(catalog))
-    channels = catalog.get("channels", []) if isinstance(catalog, dict) else []
-    if isinstance(channels, list):
-        for i, channel in enumerate(channels):
-            if not isinstance(channel, dict):
-                # Erreur de structure déjà signalée
-                continue
-            errors.extend(validate_channel_rules(channel, i))
+    if fail_fast:
+        try:
+            walk_catalog(catalog, partial(validate_channel_rules, fail_fast=True), fail_fast=True)
+        except StopValidation as stop:
+            return [stop.message]
+        return []
+    # Structure et règles sont vérifiées au cours d'un même parcours des
+    # chaînes ; les erreurs de structure restent listées en premier.
+    errors, rule_errors = walk_catalog(catalog, validate_channel_rules)
+    errors.extend(rule_errors)
     return errors
 
 
-def validate_channel_rules(channel: Dict[str, Any], idx: int) -> List[str]:
+def validate_channel_rules(channel: Dict[str, Any], idx: int, fail_fast: bool = False) -> List[str]:
     """Valide les règles métier propres à une chaîne.
 
     On vérifie les horaires globaux (begin < end), la continuité des blocs,
@@ -121,43 +195,52 @@ def validate_channel_rules(channel: Dict[str, Any], idx: int) -> List[str]:
     Args:
         channel: Dictionnaire représentant la chaîne.
         idx: Indice de la chaîne dans la liste.
+        fail_fast: Si vrai, lève :class:`StopValidation` dès que les contrôles
+            de la chaîne ou d'un de ses blocs relèvent une erreur.
 
     Returns:
         Une liste de messages d'erreurs concernant cette chaîne.
     """
+    # Une seule lecture de chaque clé de la chaîne, liée à une variable locale
+    get = channel.get
+    fillers = get("fillers", [])
+    blocks = get("blocks", [])
     errors: List[str] = []
-    prefix = f"[channel#{idx}:{channel.get('name', '?')}]"
+    prefix = _Prefix("[channel#", idx, ":", get("name", "?"), "]")
     # Valider begin < end
-    try:
-        begin = float(channel.get("begin", 0))
-        end = float(channel.get("end", 0))
-        if not (begin < end):
-            errors.append(f"{prefix} begin < end requis (begin={begin}, end={end})")
-    except Exception:
+    begin = _num(channel, "begin")
+    end = _num(channel, "end")
+    if begin is None or end is None:
         # Type invalide déjà signalé par la validation de structure
         begin = None
         end = None
-    # Vérification des fillers (genre normalisés déjà partiellement contrôlé dans la structure)
-    fillers = channel.get("fillers", [])
+    elif not (begin < end):
+        errors.append(f"{prefix} begin < end requis (begin={begin}, end={end})")
+    # Vérification des fillers (genres acceptés déjà partiellement contrôlé dans la structure)
     if isinstance(fillers, list):
         for g in fillers:
-            if g not in GENRES_NORMALISES_KEYS:
-                errors.append(f"{prefix} filler genre inconnu (clé normalisée requise) : {g}")
+            if g not in GENRES_ACCEPTES:
+                errors.append(f"{prefix} filler genre inconnu (clé normalisée ou synonyme requis) : {g}")
+    if fail_fast and errors:
+        raise StopValidation(errors[0])
     # Vérification des blocs
-    blocks = channel.get("blocks", [])
     if not isinstance(blocks, list) or len(blocks) == 0:
         # Structure invalide déjà signalée
         return errors
-    # Trier les blocs par heure de début pour vérifier la continuité
+    # Trier les blocs par heure de début pour vérifier la continuité ; chaque
+    # 'begin' n'est converti qu'une seule fois.
     try:
-        blocks_sorted = sorted(blocks, key=lambda b: float(b.get("begin", 0)))
+        parsed = [(float(b.get("begin", 0)), b) for b in blocks]
     except Exception:
         errors.append(f"{prefix} impossible de trier les blocs par 'begin' (valeurs numériques requises)")
         return errors
+    parsed.sort(key=itemgetter(0))
+    block_errors: List[str] = []
     # Vérifier que les blocs couvrent la plage [begin, end] sans trous ni chevauchements
     if begin is not None and end is not None:
-        first_begin = float(blocks_sorted[0].get("begin", 0))
-        last_end = float(blocks_sorted[-1].get("end", 0))
+        spans = [(b_begin, float(b.get("end", 0)), b) for b_begin, b in parsed]
+        first_begin = spans[0][0]
+        last_end = spans[-1][1]
         if not almost_equal(first_begin, begin):
             errors.append(
                 f"{prefix} le 1er bloc doit commencer à 'begin' (attendu {begin}, reçu {first_begin})"
@@ -166,37 +249,45 @@ def validate_channel_rules(channel: Dict[str, Any], idx: int) -> List[str]:
             errors.append(
                 f"{prefix} le dernier bloc doit finir à 'end' (attendu {end}, reçu {last_end})"
             )
-        for i in range(len(blocks_sorted) - 1):
-            cur_end = float(blocks_sorted[i].get("end", 0))
-            nxt_begin = float(blocks_sorted[i + 1].get("begin", 0))
-            if cur_end > nxt_begin + 1e-6:
-                errors.append(
-                    f"{prefix} chevauchement blocs {i} et {i+1} (end {cur_end} > begin {nxt_begin})"
-                )
-            if not almost_equal(cur_end, nxt_begin):
-                errors.append(
-                    f"{prefix} trou entre blocs {i} et {i+1} (end {cur_end} != begin {nxt_begin})"
-                )
-        # Vérifier qu'aucun bloc ne dépasse la plage globale
-        for j, b in enumerate(blocks_sorted):
-            try:
-                b_begin = float(b.get("begin", 0))
-                b_end = float(b.get("end", 0))
-                if b_begin < begin - 1e-6 or b_end > end + 1e-6:
+        # Balayage unique des blocs triés : continuité avec le bloc précédent
+        # (un chevauchement n'est pas signalé aussi comme trou), bornes de la
+        # chaîne et règles du bloc. Les deux dernières familles d'erreurs sont
+        # mises de côté pour conserver l'ordre des messages.
+        out_of_range: List[str] = []
+        add_block_errors = block_errors.extend
+        low, high = begin - 1e-6, end + 1e-6
+        cur_end = spans[0][1]
+        for j, (b_begin, b_end, block) in enumerate(spans):
+            if j:
+                if cur_end > b_begin + 1e-6:
+                    errors.append(
+                        f"{prefix} chevauchement blocs {j-1} et {j} (end {cur_end} > begin {b_begin})"
+                    )
+                elif not almost_equal(cur_end, b_begin):
                     errors.append(
-                        f"{prefix} bloc#{j} hors de la plage chaîne (block [{b_begin},{b_end}] vs [{begin},{end}])"
+                        f"{prefix} trou entre blocs {j-1} et {j} (end {cur_end} != begin {b_begin})"
                     )
-            except Exception:
-                # Types invalides déjà signalés
-                pass
-    # Valider chaque bloc
-    for j, block in enumerate(blocks_sorted):
-        if isinstance(block, dict):
-            errors.extend(validate_block_rules(block, f"{prefix}[block#{j}]"))
+                cur_end = b_end
+            if b_begin < low or b_end > high:
+                out_of_range.append(
+                    f"{prefix} bloc#{j} hors de la plage chaîne (block [{b_begin},{b_end}] vs [{begin},{end}])"
+                )
+            if isinstance(block, dict):
+                add_block_errors(validate_block_rules(block, _Prefix(prefix, "[block#", j, "]")))
+            if fail_fast and (errors or out_of_range or block_errors):
+                raise StopValidation((errors or out_of_range or block_errors)[0])
+        errors.extend(out_of_range)
+    else:
+        for j, (_, block) in enumerate(parsed):
+            if isinstance(block, dict):
+                block_errors.extend(validate_block_rules(block, _Prefix(prefix, "[block#", j, "]")))
+            if fail_fast and block_errors:
+                raise StopValidation(block_errors[0])
+    errors.extend(block_errors)
     return errors
 
 
-def validate_block_rules(block: Dict[str, Any], prefix: str) -> List[str]:
+def validate_block_rules(block: Dict[str, Any], prefix: Union[str, _Prefix]) -> List[str]:
     """Valide les règles métier propres à un bloc.
 
     On vérifie la cohérence des horaires (begin < end), la durée du bloc
@@ -205,28 +296,31 @@ def validate_block_rules(block: Dict[str, Any], prefix: str) -> List[str]:
 
     Args:
         block: Dictionnaire représentant le bloc.
-        prefix: Chaîne utilisée pour préfixer les messages d'erreurs.
+        prefix: Chaîne (ou :class:`_Prefix`) utilisée pour préfixer les
+            messages d'erreurs.
 
     Returns:
         Liste des erreurs détectées pour ce bloc.
     """
+    get = block.get
+    slot_count = get("slot_count")
+    sf = get("slot_format", {})
+    criteria = get("criteria", [])
+    shows = get("shows")
     errors: List[str] = []
     # Vérifier begin < end
-    try:
-        begin = float(block.get("begin", 0))
-        end = float(block.get("end", 0))
-        if not (begin < end):
-            errors.append(f"{prefix} begin < end requis (begin={begin}, end={end})")
-    except Exception:
+    begin = _num(block, "begin")
+    end = _num(block, "end")
+    if begin is None or end is None:
         # Type invalide déjà signalé dans la structure
         begin = None
         end = None
+    elif not (begin < end):
+        errors.append(f"{prefix} begin < end requis (begin={begin}, end={end})")
     # slot_count
-    slot_count = block.get("slot_count")
     if slot_count not in (1, 2):
         errors.append(f"{prefix} slot_count doit être 1 ou 2 (reçu {slot_count})")
     # slot_format
-    sf = block.get("slot_format", {})
     if not isinstance(sf, dict) or not is_allowed_slot_format(sf):
         errors.append(f"{prefix} slot_format non autorisé ou invalide : {sf}")
     # Durée du bloc (en heures) : (slot_duration * slot_count) / 60
@@ -236,19 +330,16 @@ def validate_block_rules(block: Dict[str, Any], prefix: str) -> List[str]:
         and isinstance(slot_count, int)
         and isinstance(sf, dict)
     ):
-        try:
-            slot_duration = float(sf.get("slot_duration", 0))
+        # Erreur de conversion éventuelle déjà signalée par la structure
+        slot_duration = _num(sf, "slot_duration")
+        if slot_duration is not None:
             expected_hours = (slot_duration * slot_count) / 60.0
             actual_hours = end - begin
             if not almost_equal(expected_hours, actual_hours):
                 errors.append(
                     f"{prefix} durée bloc {actual_hours}h ≠ {expected_hours}h attendu (slot_duration*slot_count)"
                 )
-        except Exception:
-            # Erreur de conversion, déjà signalée
-            pass
     # criteria
-    criteria = block.get("criteria", [])
     if not isinstance(criteria, list) or len(criteria) == 0:
         errors.append(f"{prefix} criteria doit être une liste non vide")
     else:
@@ -259,28 +350,116 @@ def validate_block_rules(block: Dict[str, Any], prefix: str) -> List[str]:
             errors.extend(
                 validate_criterion_rules(
                     crit,
-                    f"{prefix}[criteria#{k}]",
+                    _Prefix(prefix, "[criteria#", k, "]"),
                 )
             )
     # shows : on vérifie seulement le type (liste). Contenu non testé ici.
-    shows = block.get("shows")
     if shows is not None and not isinstance(shows, list):
         errors.append(f"{prefix} 'shows' doit être une liste")
     return errors
 
 
-def validate_criterion_rules(crit: Dict[str, Any], prefix: str) -> List[str]:
+def _check_genres(values: List[Any], prefix: Union[str, _Prefix]) -> List[str]:
+    """Erreurs pour les genres non textuels ou non normalisés de ``values``."""
+    return _check_closed_values(
+        values, GENRES_ACCEPTES, "genre",
+        lambda v: f"{prefix} genre inconnu (clé normalisée ou synonyme requis) : {v}", prefix,
+    )
+
+
+def _check_types(values: List[Any], prefix: Union[str, _Prefix]) -> List[str]:
+    """Erreurs pour les types de contenu non textuels ou inconnus de ``values``."""
+    return _check_closed_values(
+        values, ALLOWED_TYPES, "type",
+        lambda v: f"{prefix} type invalide : {v} (attendu {_ALLOWED_TYPES_SORTED})", prefix,
+    )
+
+
+def _check_closed_values(
+    values: List[Any],
+    allowed: frozenset,
+    name: str,
+    unknown_message: Callable[[str], str],
+    prefix: Union[str, _Prefix],
+) -> List[str]:
+    """Contrôle des valeurs d'une catégorie restreinte à un ensemble fermé.
+
+    Les valeurs qui ne sont pas des chaînes sont écartées d'abord : une liste
+    ou un objet ferait échouer la différence d'ensembles. Celle-ci isole
+    ensuite les chaînes inconnues en une seule opération ; on ne reparcourt
+    la liste (pour garder l'ordre et les doublons dans les messages) que s'il
+    y a une erreur.
+
+    Args:
+        values: Valeurs du critère.
+        allowed: Valeurs acceptées.
+        name: Nom de la catégorie, pour les messages de type.
+        unknown_message: Message pour une chaîne absente de ``allowed``.
+        prefix: Préfixe (chaîne ou :class:`_Prefix`) pour les messages
+            d'erreurs.
+
+    Returns:
+        Une liste d'erreurs, dans l'ordre des valeurs.
+    """
+    strings = [v for v in values if isinstance(v, str)]
+    unknown = set(strings).difference(allowed)
+    if not unknown and len(strings) == len(values):
+        return []
+    errors: List[str] = []
+    for v in values:
+        if not isinstance(v, str):
+            errors.append(f"{prefix} {name} doit être une chaîne (reçu {type(v).__name__})")
+        elif v in unknown:
+            errors.append(unknown_message(v))
+    return errors
+
+
+def _check_languages(values: List[Any], prefix: Union[str, _Prefix]) -> List[str]:
+    """Erreurs pour les langues qui ne sont pas des chaînes."""
+    return [
+        f"{prefix} language doit être une chaîne (reçu {type(v).__name__})"
+        for v in values
+        if not isinstance(v, str)
+    ]
+
+
+def _check_durations(values: List[Any], prefix: Union[str, _Prefix]) -> List[str]:
+    """Erreurs pour les durées non numériques ou non strictement positives."""
+    errors: List[str] = []
+    for v in values:
+        if not isinstance(v, (int, float)):
+            errors.append(
+                f"{prefix} duration doit être numérique en minutes (reçu {type(v).__name__})"
+            )
+        elif v <= 0:
+            errors.append(
+                f"{prefix} duration doit être > 0 (reçu {v})"
+            )
+    return errors
+
+
+# Contrôle des valeurs d'un critère, par catégorie
+_CAT_VALIDATORS: Dict[str, Callable[[List[Any], Union[str, _Prefix]], List[str]]] = {
+    "genre": _check_genres,
+    "type": _check_types,
+    "language": _check_languages,
+    "duration": _check_durations,
+}
+
+
+def validate_criterion_rules(crit: Dict[str, Any], prefix: Union[str, _Prefix]) -> List[str]:
     """Valide les règles métier pour un critère.
 
     Cette fonction vérifie que la catégorie est autorisée et que les valeurs
     fournies respectent le type attendu. Pour les genres, seules les clés
-    normalisées sont acceptées. Pour les types, seules "series" ou
+    normalisées et leurs synonymes sont acceptés. Pour les types, seules "series" ou
     "movie" sont autorisées. La durée doit être un nombre strictement
-    positif.
+    positif. Une catégorie inconnue arrête la validation du critère.
 
     Args:
         crit: Dictionnaire représentant le critère.
-        prefix: Préfixe pour les messages d'erreurs.
+        prefix: Préfixe (chaîne ou :class:`_Prefix`) pour les messages
+            d'erreurs.
 
     Returns:
         Une liste d'erreurs pour ce critère.
@@ -289,8 +468,10 @@ def validate_criterion_rules(crit: Dict[str, Any], prefix: str) -> List[str]:
     cat = crit.get("category")
     if cat not in ALLOWED_CRITERIA_CATEGORIES:
         errors.append(
-            f"{prefix} category invalide : {cat} (attendu {sorted(ALLOWED_CRITERIA_CATEGORIES)})"
+            f"{prefix} category invalide : {cat} (attendu {_ALLOWED_CATEGORIES_SORTED})"
         )
+        # Inutile de contrôler forbidden/values : ce ne seraient que des erreurs en cascade
+        return errors
     # forbidden doit être booléen
     forbidden = crit.get("forbidden")
     if not isinstance(forbidden, bool):
@@ -300,35 +481,8 @@ def validate_criterion_rules(crit: Dict[str, Any], prefix: str) -> List[str]:
     if not isinstance(values, list) or len(values) == 0:
         errors.append(f"{prefix} 'values' doit être une liste non vide")
     else:
-        # Validation par catégorie
-        if cat == "genre":
-            for v in values:
-                if v not in GENRES_NORMALISES_KEYS:
-                    errors.append(
-                        f"{prefix} genre inconnu (clé normalisée requise) : {v}"
-                    )
-        elif cat == "type":
-            for v in values:
-                if v not in ALLOWED_TYPES:
-                    errors.append(
-                        f"{prefix} type invalide : {v} (attendu {sorted(ALLOWED_TYPES)})"
-                    )
-        elif cat == "language":
-            for v in values:
-                if not isinstance(v, str):
-                    errors.append(
-                        f"{prefix} language doit être une chaîne (reçu {type(v).__name__})"
-                    )
-        elif cat == "duration":
-            for v in values:
-                if not isinstance(v, (int, float)):
-                    errors.append(
-                        f"{prefix} duration doit être numérique en minutes (reçu {type(v).__name__})"
-                    )
-                elif v <= 0:
-                    errors.append(
-                        f"{prefix} duration doit être > 0 (reçu {v})"
-                    )
+        # Validation par catégorie (cat est forcément connue ici)
+        errors.extend(_CAT_VALIDATORS[cat](values, prefix))
     return errors
 
 
@@ -336,35 +490,37 @@ def main(args: List[str]) -> int:
     """Point d'entrée CLI pour valider un catalogue.
 
     Charge le fichier JSON passé en argument, exécute la validation de
-    structure puis de règles et affiche les erreurs éventuelles.
+    structure puis de règles et affiche les erreurs éventuelles. Avec
+    l'option ``--fail-fast``, seule la première erreur est recherchée et
+    affichée (utile lorsque seul le code de retour compte).
 
     Returns:
         0 si aucune erreur, 1 sinon (ou 2 en cas de mauvaise utilisation).
     """
+    fail_fast = "--fail-fast" in args[1:]
+    args = [a for a in args if a != "--fail-fast"]
     if len(args) < 2:
         print(
-            "Usage : python validate_catalog_rules.py <catalog.json>",
+            "Usage : python validate_catalog_rules.py <catalog.json> [--fail-fast]",
             file=sys.stderr,
         )
         return 2
     path = args[1]
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = load_json(path)
     except json.JSONDecodeError as exc:
         print(f"❌ Le fichier n'est pas un JSON valide : {exc}")
         return 1
     except FileNotFoundError:
         print(f"❌ Fichier introuvable : {path}")
         return 1
-    errors = validate_catalog_rules(data)
+    errors = validate_catalog_rules(data, fail_fast=fail_fast)
     if not errors:
         print("✅ Catalogue valide (structure et règles).")
         return 0
     else:
-        print("❌ Erreurs détectées :")
-        for e in errors:
-            print("-", e)
+        # Une seule écriture plutôt qu'un print() par erreur
+        sys.stdout.write("❌ Erreurs détectées :\n- " + "\n- ".join(errors) + "\n")
         return 1
 
 
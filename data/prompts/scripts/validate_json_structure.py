@@ -29,40 +29,165 @@ programmatique (par exemple depuis des tests unitaires) : utilisez
 from __future__ import annotations
 
 import json
+import mmap
+import os
 import sys
-from typing import Any, Dict, List
-
-# Constantes pour les catégories et types autorisés
-ALLOWED_CRITERIA_CATEGORIES = {"genre", "type", "language", "duration"}
-ALLOWED_TYPES = {"series", "movie"}
-
-# Genres normalisés – les clés attendues côté agent. Voir specification.
-GENRES_NORMALISES_KEYS = {
-    "Podcast",
-    "Animation",
-    "Science-Fiction",
-    "Fantastique",
-    "Family",
-    "Horror",
-    "Mini-Series",
-    "Documentaire",
-    "Histoire",
-    "Action",
-    "Aventure",
-    "Crime",
-    "War & Politics",
-    "Talk Show",
-    "Comédie",
-    "Jeux télé",
-    "Sport",
-    "Western",
-    "Drame",
-    "Martial Arts",
-    "Suspense",
-    "Mystery",
-    "Romance",
-    "YouTube",
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:  # Optionnel : validation compilée du cas nominal
+    import fastjsonschema
+except ImportError:  # pragma: no cover - dépendance facultative
+    fastjsonschema = None
+
+try:  # Optionnel : parseur JSON en C, plus rapide que json
+    import orjson
+except ImportError:  # pragma: no cover - dépendance facultative
+    orjson = None  # type: ignore[assignment]
+
+# Constantes pour les catégories et types autorisés (frozenset : immuables)
+ALLOWED_CRITERIA_CATEGORIES = frozenset({"genre", "type", "language", "duration"})
+ALLOWED_TYPES = frozenset({"series", "movie"})
+
+# Genres normalisés – les clés attendues côté agent, avec leurs synonymes
+# acceptés (même table que catalog_validation.py). Voir specification.
+GENRES_NORMALISES: Dict[str, List[str]] = {
+    "Podcast": ["Podcast"],
+    "Animation": ["Animation", "Anime"],
+    "Science-Fiction": ["Science-Fiction", "Science Fiction", "Science-Fiction & Fantastique"],
+    "Fantastique": ["Fantastique", "Fantasy", "Science-Fiction & Fantastique"],
+    "Family": ["Family", "Familial", "Children"],
+    "Horror": ["Horror", "Horreur"],
+    "Mini-Series": ["Mini-Series"],
+    "Documentaire": ["Documentaire", "Vulgarisation"],
+    "Histoire": ["Histoire", "History"],
+    "Action": ["Action", "Action & Adventure"],
+    "Aventure": ["Aventure", "Adventure", "Action & Adventure"],
+    "Crime": ["Crime"],
+    "War & Politics": ["War & Politics", "Guerre"],
+    "Talk Show": ["Talk Show"],
+    "Comédie": ["Comédie", "Comedy"],
+    "Jeux télé": ["Jeux télé"],
+    "Sport": ["Sport"],
+    "Western": ["Western"],
+    "Drame": ["Drame", "Drama"],
+    "Martial Arts": ["Martial Arts"],
+    "Suspense": ["Suspense", "Thriller"],
+    "Mystery": ["Mystery", "Mystère"],
+    "Romance": ["Romance"],
+    "YouTube": ["YouTube"],
 }
+GENRES_NORMALISES_KEYS = frozenset(GENRES_NORMALISES)
+
+# Toutes les orthographes acceptées pour un genre : clés normalisées et synonymes
+GENRES_ACCEPTES = frozenset(
+    syn for canon, syns in GENRES_NORMALISES.items() for syn in (canon, *syns)
+)
+
+
+# Schéma JSON équivalent (ou plus strict) aux contrôles ci-dessous. Il ne sert
+# qu'à reconnaître rapidement un catalogue valide : dès qu'il échoue, le
+# parcours détaillé est exécuté pour produire tous les messages d'erreurs.
+_NUMBER = {"type": "number"}
+CATALOG_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "required": ["name", "step", "channels"],
+    "properties": {
+        "channels": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["name", "description", "begin", "end", "fillers", "blocks"],
+                "properties": {
+                    "name": {"type": "string"},
+                    "description": {"type": "string"},
+                    "begin": _NUMBER,
+                    "end": _NUMBER,
+                    "fillers": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": sorted(GENRES_ACCEPTES)},
+                    },
+                    "blocks": {
+                        "type": "array",
+                        "minItems": 1,
+                        "items": {
+                            "type": "object",
+                            "required": ["criteria", "begin", "end", "slot_count", "slot_format", "shows"],
+                            "properties": {
+                                "begin": _NUMBER,
+                                "end": _NUMBER,
+                                "slot_count": {"type": "integer"},
+                                "slot_format": {
+                                    "type": "object",
+                                    "required": ["show_min_duration", "show_max_duration", "slot_duration"],
+                                    "properties": {
+                                        "show_min_duration": _NUMBER,
+                                        "show_max_duration": _NUMBER,
+                                        "slot_duration": _NUMBER,
+                                    },
+                                },
+                                "criteria": {
+                                    "type": "array",
+                                    "minItems": 1,
+                                    "items": {
+                                        "type": "object",
+                                        "required": ["category", "values", "forbidden"],
+                                        "properties": {
+                                            "category": {"type": "string"},
+                                            "values": {"type": "array", "minItems": 1},
+                                            "forbidden": {"type": "boolean"},
+                                        },
+                                    },
+                                },
+                                "shows": {"type": "array"},
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+# Validateurs compilés, indexés par la forme JSON canonique du schéma
+_VALIDATOR_CACHE: Dict[str, Callable[[Any], Any]] = {}
+
+
+def get_validator(schema: Dict[str, Any]) -> Callable[[Any], Any]:
+    """Renvoie le validateur fastjsonschema d'un schéma, compilé une seule fois.
+
+    La compilation génère et exécute du code Python : elle est bien plus
+    coûteuse qu'une validation. Les validateurs sont donc conservés au
+    niveau du module et réutilisés pour tout schéma identique.
+
+    Args:
+        schema: Schéma JSON à compiler.
+
+    Returns:
+        La fonction de validation compilée.
+    """
+    key = json.dumps(schema, sort_keys=True)
+    validator = _VALIDATOR_CACHE.get(key)
+    if validator is None:
+        validator = fastjsonschema.compile(schema)
+        _VALIDATOR_CACHE[key] = validator
+    return validator
+
+
+_VALIDATOR: Optional[Callable[[Any], Any]] = (
+    get_validator(CATALOG_SCHEMA) if fastjsonschema is not None else None
+)
+
+
+class StopValidation(Exception):
+    """Interrompt une validation ``fail_fast`` à la première erreur.
+
+    Attributes:
+        message: Le premier message d'erreur rencontré.
+    """
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
 
 
 def validate_catalog_structure(catalog: Dict[str, Any]) -> List[str]:
@@ -71,6 +196,10 @@ def validate_catalog_structure(catalog: Dict[str, Any]) -> List[str]:
     Vérifie que le dictionnaire fourni contient les clés principales
     (`name`, `step`, `channels`) et que `channels` est une liste. Ensuite
     chaque chaîne est validée à son tour via :func:`validate_channel_structure`.
+    Si ``fastjsonschema`` est installé, un catalogue conforme à
+    :data:`CATALOG_SCHEMA` est accepté sans ce parcours, sauf si un
+    ``slot_count`` est un flottant : le schéma tient ``2.0`` pour un entier,
+    pas le parcours.
 
     Args:
         catalog: Dictionnaire représentant le catalogue.
@@ -78,7 +207,57 @@ def validate_catalog_structure(catalog: Dict[str, Any]) -> List[str]:
     Returns:
         Une liste de messages d'erreurs. Vide si aucune erreur.
     """
+    if _VALIDATOR is not None:
+        try:
+            _VALIDATOR(catalog)
+            if not _has_float_slot_count(catalog):
+                return []
+        except fastjsonschema.JsonSchemaException:
+            pass
+    return walk_catalog(catalog)[0]
+
+
+def _has_float_slot_count(catalog: Dict[str, Any]) -> bool:
+    """Indique si un bloc d'un catalogue conforme au schéma a un ``slot_count`` flottant.
+
+    Args:
+        catalog: Catalogue déjà accepté par :data:`CATALOG_SCHEMA`.
+
+    Returns:
+        Vrai si au moins un ``slot_count`` est de type ``float``.
+    """
+    return any(
+        isinstance(block["slot_count"], float)
+        for channel in catalog["channels"]
+        for block in channel["blocks"]
+    )
+
+
+def walk_catalog(
+    catalog: Dict[str, Any],
+    channel_rules: Optional[Callable[[Dict[str, Any], int], List[str]]] = None,
+    fail_fast: bool = False,
+) -> Tuple[List[str], List[str]]:
+    """Parcourt le catalogue une seule fois pour la structure et les règles.
+
+    Chaque chaîne est validée structurellement puis, si ``channel_rules`` est
+    fourni, immédiatement soumise aux règles métier tant qu'elle est encore
+    « chaude ». Les deux familles d'erreurs sont accumulées séparément afin
+    que l'appelant puisse conserver l'ordre historique (structure d'abord,
+    règles ensuite).
+
+    Args:
+        catalog: Dictionnaire représentant le catalogue.
+        channel_rules: Fonction ``(channel, idx) -> erreurs`` appelée pour
+            chaque chaîne de type objet, ou ``None`` pour la structure seule.
+        fail_fast: Si vrai, lève :class:`StopValidation` dès qu'une erreur
+            est relevée (au niveau du catalogue ou d'une chaîne).
+
+    Returns:
+        Un tuple ``(erreurs_structure, erreurs_regles)``.
+    """
     errors: List[str] = []
+    rule_errors: List[str] = []
     # Clés obligatoires au niveau catalogue
     required_keys = ("name", "step", "channels")
     for key in required_keys:
@@ -88,14 +267,20 @@ def validate_catalog_structure(catalog: Dict[str, Any]) -> List[str]:
     channels = catalog.get("channels")
     if channels is not None and not isinstance(channels, list):
         errors.append("[catalog] 'channels' doit être une liste")
+    if fail_fast and errors:
+        raise StopValidation(errors[0])
     # Valider chaque chaîne
     if isinstance(channels, list):
         for i, channel in enumerate(channels):
             if not isinstance(channel, dict):
                 errors.append(f"[catalog] channel#{i} doit être un objet JSON")
-                continue
-            errors.extend(validate_channel_structure(channel, i))
-    return errors
+            else:
+                errors.extend(validate_channel_structure(channel, i))
+                if channel_rules is not None:
+                    rule_errors.extend(channel_rules(channel, i))
+            if fail_fast and (errors or rule_errors):
+                raise StopValidation((errors or rule_errors)[0])
+    return errors, rule_errors
 
 
 def validate_channel_structure(channel: Dict[str, Any], idx: int) -> List[str]:
@@ -139,8 +324,8 @@ def validate_channel_structure(channel: Dict[str, Any], idx: int) -> List[str]:
             for filler in fillers:
                 if not isinstance(filler, str):
                     errors.append(f"{prefix} 'fillers' doit contenir uniquement des chaînes de caractères")
-                elif filler not in GENRES_NORMALISES_KEYS:
-                    errors.append(f"{prefix} filler genre inconnu (clé normalisée requise) : {filler}")
+                elif filler not in GENRES_ACCEPTES:
+                    errors.append(f"{prefix} filler genre inconnu (clé normalisée ou synonyme requis) : {filler}")
     # Blocks
     blocks = channel.get("blocks")
     if blocks is not None:
@@ -247,6 +432,32 @@ def validate_criterion_structure(crit: Dict[str, Any], prefix: str) -> List[str]
     return errors
 
 
+def load_json(path: str) -> Any:
+    """Charge un fichier JSON, via orjson lorsqu'il est installé.
+
+    ``orjson.JSONDecodeError`` dérivant de ``json.JSONDecodeError``, les
+    appelants gèrent les deux parseurs avec le même ``except``. Avec orjson,
+    le fichier est projeté en mémoire (mmap) et analysé directement depuis
+    ces octets, sans copie intermédiaire ni décodage en ``str``.
+
+    Args:
+        path: Chemin du fichier JSON.
+
+    Returns:
+        Les données décodées.
+    """
+    if orjson is not None:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap refuse les fichiers vides ; orjson lèvera l'erreur JSON
+                return orjson.loads(b"")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 def main(args: List[str]) -> int:
     """Point d'entrée pour le mode CLI.
 
@@ -262,8 +473,7 @@ def main(args: List[str]) -> int:
         return 2
     path = args[1]
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = load_json(path)
     except json.JSONDecodeError as exc:
         print(f"❌ Le fichier n'est pas un JSON valide : {exc}")
         return 1
@@ -275,9 +485,7 @@ def main(args: List[str]) -> int:
         print("✅ Structure JSON valide.")
         return 0
     else:
-        print("❌ Erreurs de structure détectées :")
-        for e in errors:
-            print("-", e)
+        sys.stdout.write("❌ Erreurs de structure détectées :\n- " + "\n- ".join(errors) + "\n")
         return 1
 
 
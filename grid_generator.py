@@ -1,21 +1,37 @@
+import hashlib
 import json
 import os
 import random
 import re
 import sys
-import time
-from collections import defaultdict
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import cached_property
+from operator import itemgetter
 
 import jinja2
 import requests
-from playwright.sync_api import sync_playwright
+from requests.adapters import HTTPAdapter
+from playwright.sync_api import expect, sync_playwright
+from urllib3.util.retry import Retry
+
+try:
+    import ijson  # optionnel : lecture en flux des réponses Jellyfin volumineuses
+except ImportError:
+    ijson = None  # type: ignore[assignment]
+try:
+    import orjson  # optionnel : (dé)sérialisation du cache des shows bien plus rapide
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 import settings
 from channel_description import print_channel_full_description
 from data_types import Show, CategoryCriteria, Criteria, SlotFormat, ChannelBlock, Channel, Catalog, \
     CatalogGenerationStep
 from settings import DATA_DIR, PLAYOUT_DIR, ERSATZTV_PLAYOUT_DIR, SUPER_CATEGORIES
-from utils import deserialize_enum_keys
+from utils import atomic_open, deserialize_enum_keys, enum_keys_object_hook
 from utils import hour_float_to_hour_minute
 
 random.seed(666)
@@ -27,11 +43,18 @@ def write_log(log):
 
 
 class ShowSelector:
+    max_block_shows = 10
 
-    def __init__(self, channel: Channel, show_list: list[Show], other_channels: list[Channel] = None):
+    def __init__(self, channel: Channel, show_list: list[Show], other_channels: list[Channel] = None,
+                 show_index: tuple[dict, list] = None):
         self.channel = channel
         self.show_list = show_list
         self.other_channels = other_channels
+        # index inversé des propriétés, construit une fois et réutilisé pour tous les blocks ;
+        # il peut être fourni (index_shows(show_list)) pour être partagé entre chaînes
+        self._show_index = show_index if show_index is not None else self.index_shows(show_list)
+        # shows retenus par critère, les blocks d'une chaîne partageant souvent les mêmes critères
+        self._matches_cache: dict[tuple, set[int]] = {}
 
     def generate_schedules(self):
         for block in self.channel['blocks']:
@@ -44,44 +67,81 @@ class ShowSelector:
                 },
                 *block['criteria']
             ]
-            matching_shows = self.get_matching_shows(self.show_list, criteria=all_criteria)
+            matching_shows = self.get_matching_shows(self.show_list, criteria=all_criteria,
+                                                     target=self.max_block_shows)
             block['shows'] = matching_shows
-        self.curate_channel(self.channel)
-
-    def get_matching_shows(self, show_list: list[Show], criteria: list[Criteria]):
-        matching_shows = []
-        for show in show_list:
-            matches = []
-            for crit in criteria:
-                matches.append(self.check_criteria(show, crit))
-            if all(matches):
-                matching_shows.append(show)
-        return matching_shows
+
+    def get_matching_shows(self, show_list: list[Show], criteria: list[Criteria], target: int = None):
+        if show_list is self.show_list:
+            show_index, cache = self._show_index, self._matches_cache
+        else:
+            show_index, cache = self.index_shows(show_list), {}
+        # indices des shows respectant chaque critère ; un critère sans aucun show suffit
+        # à conclure sans calculer les suivants
+        all_matches = []
+        for crit in criteria:
+            key = (crit['category'], frozenset(crit['values']), crit.get('forbidden', False))
+            matches = cache.get(key)
+            if matches is None:
+                matches = cache[key] = self.matching_indices(show_index, len(show_list), crit)
+            if not matches:
+                all_matches = [matches]
+                break
+            all_matches.append(matches)
+        if all_matches:
+            # intersection en partant du critère le plus sélectif : chaque étape ne
+            # parcourt que les candidats restants
+            all_matches.sort(key=len)
+            candidates = all_matches[0].intersection(*all_matches[1:])
+        else:
+            candidates = range(len(show_list))
+        selected = sorted(candidates)
+        if target is not None:
+            # tirage sans remise, seule sélection aléatoire des shows d'un block : même
+            # résultat que mélanger puis tronquer
+            selected = random.sample(selected, min(target, len(selected)))
+        return [show_list[i] for i in selected]
 
     @staticmethod
-    def curate_channel(channel: Channel):
-        for block in channel['blocks']:
-            items = block['shows']
-            random.shuffle(items)
-            block['shows'] = items[:10]
+    def index_shows(show_list: list[Show]) -> tuple[dict, list[tuple[float, float, int]]]:
+        # catégorie -> valeur -> indices des shows ayant cette valeur ; pour la durée,
+        # liste (min, max, indice) triée par min, sans les shows de durée inconnue
+        by_category: dict[CategoryCriteria, dict[str | int | float, set[int]]] = {}
+        durations = []
+        for i, show in enumerate(show_list):
+            for category, values in show.get('properties', {}).items():
+                if category == CategoryCriteria.DURATION:
+                    if values and all(v is not None for v in values):
+                        durations.append((min(values), max(values), i))
+                else:
+                    by_value = by_category.setdefault(category, {})
+                    for value in values:
+                        by_value.setdefault(value, set()).add(i)
+        durations.sort()
+        return by_category, durations
 
     @staticmethod
-    def check_criteria(show: Show, criteria: Criteria) -> bool:
+    def matching_indices(show_index: tuple[dict, list], show_count: int, criteria: Criteria) -> set[int]:
+        # indices des shows respectant le critère : durées du show strictement comprises
+        # entre les bornes du critère, ou au moins une valeur commune ; inversé si interdit
         values = criteria['values']
         category = criteria['category']
-        show_properties = show.get('properties', {})
         forbidden = criteria.get('forbidden', False)
+        by_category, durations = show_index
 
-        if len(values) > 0:
-            props = set(show_properties.get(category, []))
-            if criteria['category'] == CategoryCriteria.DURATION:
-                if all([i is not None for i in props]):
-                    match = min(values) < min(props) and max(props) < max(values)
-                    return match if not forbidden else not match
-            else:
-                match = any(props.intersection(set(values)))
-                return match if not forbidden else not match
-        return False
+        if len(values) == 0:
+            return set()
+
+        if category == CategoryCriteria.DURATION:
+            lowest, highest = min(values), max(values)
+            start = bisect_right(durations, lowest, key=itemgetter(0))
+            matched = {i for _, show_max, i in durations[start:] if show_max < highest}
+            # une durée inconnue ne correspond jamais, même pour un critère interdit
+            return {i for _, _, i in durations} - matched if forbidden else matched
+
+        by_value = by_category.get(category, {})
+        matched = set().union(*(by_value.get(value, ()) for value in values))
+        return set(range(show_count)) - matched if forbidden else matched
 
 
 class ChannelMaker:
@@ -119,42 +179,44 @@ class ChannelMaker:
         selected_slot_counts = self.multiple_random_selection(self.slot_count_options, 2)
         self.channel["available_slot_count"] = selected_slot_counts
         self.channel["available_slot_format"] = selected_slot_formats
+        # format et nombre de slots minimaux, utilisés quand la journée arrive à sa fin
+        self._min_slot_format: SlotFormat = min(selected_slot_formats, key=itemgetter("slot_duration"))
+        self._min_slot_count: int = min(selected_slot_counts)
         self.channel['begin'] = self.channel_begin_at
         self.channel["end"] = self.channel_end_at
 
     def set_blocks(self):
         begin = self.channel['begin']
         blocks: list[ChannelBlock] = []
-        force_minimum = False
-        retry = 0
-        while True:
-            block = self.generate_block(begin, force_minimum)
-            if block:
+        # blocs tirés au hasard jusqu'au premier qui dépasse la fin de journée, puis
+        # blocs minimaux tant qu'ils tiennent : le bloc minimal est déterministe, un
+        # échec n'a pas à être retenté
+        for force_minimum in (False, True):
+            while True:
+                block = self.generate_block(begin, force_minimum)
+                if not block:
+                    break
                 begin = block['end']
                 blocks.append(block)
-                retry = 0
-            else:
-                force_minimum = True
-                retry += 1
-            if retry > 1:
-                break
         self.channel['blocks'] = blocks
 
     def generate_block(self, begin: int, force_minimum=False) -> ChannelBlock | None:
+        channel = self.channel
         block: ChannelBlock = dict()
         block['begin'] = begin
 
-        selected_slot_format: SlotFormat = random.choice(self.channel['available_slot_format']) if not force_minimum \
-            else min(self.channel['available_slot_format'], key=lambda s: s["slot_duration"])
-
-        selected_slot_count = random.choice(self.channel['available_slot_count']) if not force_minimum else min(
-            self.channel['available_slot_count'])
+        if force_minimum:
+            selected_slot_format: SlotFormat = self._min_slot_format
+            selected_slot_count = self._min_slot_count
+        else:
+            selected_slot_format = random.choice(channel['available_slot_format'])
+            selected_slot_count = random.choice(channel['available_slot_count'])
 
         block_duration = self.minute_to_float_hour(selected_slot_format["slot_duration"] * selected_slot_count)
-        end_date = block['begin'] + block_duration
+        end_date = begin + block_duration
         normalized_end_date = self.normalize_hour_to_day(end_date)
 
-        if end_date != normalized_end_date and normalized_end_date > self.channel['end']:
+        if end_date != normalized_end_date and normalized_end_date > channel['end']:
             return None
         block['end'] = end_date  # normalized_end_date
         block['slot_count'] = selected_slot_count
@@ -181,12 +243,10 @@ class ChannelMaker:
 
     @staticmethod
     def multiple_random_selection(options: list[any], maximum_option_count):
-        option_count = len(options)
-        option_count = option_count if option_count < maximum_option_count else maximum_option_count
+        option_count = min(len(options), maximum_option_count)
         option_kept_count = random.randint(1, option_count)
-        random.shuffle(options)
-        option_kept = options[:option_kept_count]
-        return option_kept
+        # sample ne modifie pas la liste reçue (propriétés et formats partagés)
+        return random.sample(options, option_kept_count)
 
     @staticmethod
     def minute_to_float_hour(duration: int | float) -> float:
@@ -198,6 +258,10 @@ class ChannelMaker:
 
 
 class JellyfinShowRetriever:
+    # types d'items Jellyfin retenus comme shows
+    show_types = frozenset({'Movie', 'Series'})
+    # identifiants envoyés par requête groupée
+    ids_per_request = 100
 
     def __init__(self, base_url: str, api_key: str, username: str):
         self.base_url = base_url.rstrip('/')
@@ -207,10 +271,20 @@ class JellyfinShowRetriever:
             'X-Emby-Token': self.api_key,
             'Accept': 'application/json'
         }
-        self.user_id = self.get_user_id_from_username()
+        # session partagée : connexion keep-alive réutilisée d'une requête à l'autre, et
+        # nouvelles tentatives sur les erreurs de connexion passagères
+        self.session = requests.Session()
+        self.session.mount(self.base_url, HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.2)))
+        self.session.headers.update(self.headers)
 
         self.show_file_path = os.path.join(DATA_DIR, "shows.json")
 
+    @cached_property
+    def user_id(self) -> str | None:
+        # résolu à la première requête qui en a besoin : pas d'appel à Jellyfin
+        # quand les shows sont relus depuis le cache
+        return self.get_user_id_from_username()
+
     def get_shows(self, limit=100, reload=False) -> list[Show]:
         if os.path.exists(self.show_file_path) and not reload:
             return self.load_shows()
@@ -223,105 +297,213 @@ class JellyfinShowRetriever:
         params = {
             'IncludeItemTypes': 'Movie,Series',
             'Recursive': 'true',
-            'Fields': 'Genres,Tags,MediaStreams,RunTimeTicks',
+            'Fields': 'Genres,MediaStreams,RunTimeTicks',
             'Limit': limit,
+            'EnableImages': 'false',
+            'EnableUserData': 'false',
+            'EnableTotalRecordCount': 'false',
             'UserId': self.user_id
         }
 
-        response = requests.get(url, headers=self.headers, params=params)
-        items = response.json().get('Items', [])
-
         show_list: list[Show] = []
-        for item in items:
-            show: Show = {
-                "name": item.get("Name"),
-                "properties": {
-                    CategoryCriteria.GENRE: item.get('Genres')
-                }
-            }
-
-            media_type = item.get('Type')
+        series: list[tuple[str, Show]] = []
+        # les items sont traités au fil du parsing de la réponse
+        with self.session.get(url, params=params, stream=True) as response:
+            for item in self._iter_items(response):
+                media_type = item.get('Type')
 
-            if media_type not in ['Movie', 'Series']:
-                continue
-
-            if media_type == 'Movie':
-                media_streams = item.get('MediaStreams', [])
-                audio_languages = list({
-                    stream.get('Language') for stream in media_streams
-                    if stream.get('Type') == 'Audio' and stream.get('Language')
-                })
-                runtime_ticks = item.get('RunTimeTicks', 0)
-                duration = runtime_ticks / 10_000_000 / 60 if runtime_ticks else None
+                if media_type not in self.show_types:
+                    continue
 
-                show['properties'][CategoryCriteria.TYPE] = ["movie"]
-                show['properties'][CategoryCriteria.DURATION] = [duration, duration]
-                show['properties'][CategoryCriteria.LANGUAGE] = audio_languages
+                show: Show = {
+                    "name": item.get("Name"),
+                    "properties": {
+                        CategoryCriteria.GENRE: item.get('Genres')
+                    }
+                }
 
+                if media_type == 'Movie':
+                    audio_languages = self.get_audio_languages(item.get('MediaStreams', []))
+                    runtime_ticks = item.get('RunTimeTicks', 0)
+                    duration = runtime_ticks / 10_000_000 / 60 if runtime_ticks else None
+
+                    show['properties'][CategoryCriteria.TYPE] = ["movie"]
+                    show['properties'][CategoryCriteria.DURATION] = [duration, duration]
+                    show['properties'][CategoryCriteria.LANGUAGE] = audio_languages
+
+                else:
+                    show['properties'][CategoryCriteria.TYPE] = ["series"]
+                    series.append((item.get('Id'), show))
+                if show:
+                    show_list.append(show)
+
+        if not series:
+            return show_list
+        # une série sans épisode est écartée
+        summaries = self.get_episode_summaries([series_id for series_id, _ in series])
+        languages = self.get_items_audio_languages([summary['first_episode_id'] for summary in summaries.values()])
+        failed = set()
+        for series_id, show in series:
+            summary = summaries.get(series_id)
+            if summary is None:
+                failed.add(id(show))
             else:
-                show['properties'][CategoryCriteria.TYPE] = ["series"]
-                try:
-                    self.set_series_info(item.get('Id'), show)
-                except IndexError:
-                    continue
-            if show:
-                show_list.append(show)
-
+                self.set_series_info(show, summary, languages.get(summary['first_episode_id'], []))
+        if failed:
+            show_list = [show for show in show_list if id(show) not in failed]
         return show_list
 
+    @staticmethod
+    def _iter_items(response: requests.Response):
+        # avec ijson, les items sont lus un à un depuis le flux plutôt qu'après
+        # chargement complet de la réponse ; à défaut, orjson parse le corps entier
+        if ijson is not None:
+            response.raw.decode_content = True
+            yield from ijson.items(response.raw, 'Items.item', use_float=True)
+        elif orjson is not None:
+            yield from orjson.loads(response.content).get('Items', [])
+        else:
+            yield from response.json().get('Items', [])
+
+    @staticmethod
+    def get_audio_languages(media_streams: list[dict]) -> list[str]:
+        # langues dans l'ordre des pistes ; quelques pistes par fichier, une liste suffit
+        # pour écarter les doublons
+        languages = []
+        for stream in media_streams:
+            language = stream.get('Language')
+            if language and stream.get('Type') == 'Audio' and language not in languages:
+                languages.append(language)
+        return languages
+
     def get_user_id_from_username(self) -> str | None:
         url = f"{self.base_url}/Users"
 
-        response = requests.get(url, headers=self.headers)
+        response = self.session.get(url)
         response.raise_for_status()
         users = response.json()
         for user in users:
             if user.get("Name") == self.username:
                 return user.get("Id")
 
-    def set_series_info(self, series_id, show: Show):
-        url = f"{self.base_url}/Shows/{series_id}/Episodes"
+    def get_episode_summaries(self, series_ids: list[str]) -> dict[str, dict]:
+        # une requête par série retenue (ParentId) : seuls leurs épisodes sont lus, sans
+        # parcourir la bibliothèque ni paginer. Seules les durées sont demandées, et il ne
+        # reste de chaque série que son premier épisode (tri par saison puis numéro) et
+        # ses bornes en ticks
+        url = f"{self.base_url}/Items"
         params = {
-            'UserId': self.user_id,
-            # 'Limit': 1,
-            'Fields': 'MediaStreams,RunTimeTicks'
+            'IncludeItemTypes': 'Episode',
+            'Recursive': 'true',
+            'Fields': 'RunTimeTicks',
+            'SortBy': 'ParentIndexNumber,IndexNumber',
+            'EnableImages': 'false',
+            'EnableUserData': 'false',
+            'EnableTotalRecordCount': 'false',
+            'UserId': self.user_id
         }
-        response = requests.get(url, headers=self.headers, params=params)
-        episodes = response.json().get('Items', [])
-
-        first_episode = episodes[0]
-        media_streams = first_episode.get('MediaStreams', [])
-        audio_languages = list({
-            stream.get('Language') for stream in media_streams
-            if stream.get('Type') == 'Audio' and stream.get('Language')
-        })
-        durations = [(ep.get('RunTimeTicks') / 10_000_000 / 60) for ep in episodes if ep.get('RunTimeTicks')]
-        durations = durations if len(durations) else [0]
-        show['properties'][CategoryCriteria.DURATION] = [min(durations), max(durations)]
-        show['properties'][CategoryCriteria.LANGUAGE] = [i for i in set(audio_languages)]
+        summaries: dict[str, dict] = {}
+        for series_id in series_ids:
+            summary = None
+            with self.session.get(url, params={**params, 'ParentId': series_id}, stream=True) as response:
+                for episode in self._iter_items(response):
+                    if summary is None:
+                        summary = summaries[series_id] = {
+                            'first_episode_id': episode.get('Id'), 'shortest': None, 'longest': None
+                        }
+                    ticks = episode.get('RunTimeTicks')
+                    if ticks:
+                        if summary['shortest'] is None or ticks < summary['shortest']:
+                            summary['shortest'] = ticks
+                        if summary['longest'] is None or ticks > summary['longest']:
+                            summary['longest'] = ticks
+        return summaries
+
+    def get_items_audio_languages(self, item_ids: list[str]) -> dict[str, list[str]]:
+        # pistes audio des seuls items demandés (le premier épisode de chaque série),
+        # par lots d'identifiants pour garder des URLs raisonnables
+        url = f"{self.base_url}/Items"
+        languages = {}
+        for start in range(0, len(item_ids), self.ids_per_request):
+            params = {
+                'Ids': ','.join(item_ids[start:start + self.ids_per_request]),
+                'Fields': 'MediaStreams',
+                'EnableImages': 'false',
+                'EnableUserData': 'false',
+                'EnableTotalRecordCount': 'false',
+                'UserId': self.user_id
+            }
+            with self.session.get(url, params=params, stream=True) as response:
+                for item in self._iter_items(response):
+                    languages[item.get('Id')] = self.get_audio_languages(item.get('MediaStreams', []))
+        return languages
+
+    @staticmethod
+    def set_series_info(show: Show, summary: dict, audio_languages: list[str]):
+        shortest, longest = summary['shortest'], summary['longest']
+        if shortest is None:
+            show['properties'][CategoryCriteria.DURATION] = [0, 0]
+        else:
+            show['properties'][CategoryCriteria.DURATION] = [shortest / 10_000_000 / 60, longest / 10_000_000 / 60]
+        show['properties'][CategoryCriteria.LANGUAGE] = audio_languages
 
     def load_shows(self) -> list[Show]:
-        with open(self.show_file_path, "r", encoding="utf-8") as f:
-            loaded_data = json.load(f)
-        restored_shows: list[Show] = deserialize_enum_keys(loaded_data)
+        if orjson is not None:
+            # orjson n'a pas d'object_hook : les clés sont converties après coup
+            with open(self.show_file_path, "rb") as f:
+                restored_shows: list[Show] = deserialize_enum_keys(orjson.loads(f.read()))
+        else:
+            with open(self.show_file_path, "r", encoding="utf-8") as f:
+                restored_shows = json.load(f, object_hook=enum_keys_object_hook)
         return restored_shows
 
     def save_shows(self, shows):
-        with open(self.show_file_path, "w", encoding="utf-8", ) as f:
-            json.dump(shows, f, indent=4, ensure_ascii=False)
+        # fichier de cache : pas d'indentation, il n'a pas vocation à être lu
+        if orjson is not None:
+            # OPT_NON_STR_KEYS : les clés CategoryCriteria sont écrites par leur valeur
+            with atomic_open(self.show_file_path, "wb") as f:
+                f.write(orjson.dumps(shows, option=orjson.OPT_NON_STR_KEYS))
+        else:
+            with atomic_open(self.show_file_path, "w", encoding="utf-8", ) as f:
+                json.dump(shows, f, ensure_ascii=False)
 
 
 class ShowAnalyzer:
+    # format des propriétés en cache : à incrémenter à chaque changement de
+    # get_available_properties pour écarter les caches écrits avant
+    properties_cache_version = 1
 
     def __init__(self, shows: list[Show]):
         self.shows = shows
 
     def get_available_properties(self) -> dict[CategoryCriteria, list[str | int | float]]:
-        properties = defaultdict(list)
+        # ensembles alimentés au fil des shows, convertis en listes une seule fois ;
+        # les valeurs inconnues (durée None) ne sont pas proposées
+        properties: dict[CategoryCriteria, set] = {}
         for show in self.shows:
-            for p in show['properties']:
-                values = show['properties'][p]
-                properties[p] = list(set(([*values, *properties[p]])))
+            for p, values in show['properties'].items():
+                known = properties.get(p)
+                if known is None:
+                    known = properties[p] = set()
+                known.update(v for v in values if v is not None)
+        return {p: list(values) for p, values in properties.items()}
+
+    def get_cached_available_properties(self, show_file_path: str) -> dict[CategoryCriteria, list[str | int | float]]:
+        # propriétés conservées sur disque tant que le cache des shows dont elles sont tirées
+        # (empreinte de son contenu) et le format du calcul n'ont pas changé
+        with open(show_file_path, "rb") as f:
+            source_hash = hashlib.blake2b(f.read()).hexdigest()
+        cache_file_path = os.path.join(DATA_DIR, "available_properties.json")
+        if os.path.exists(cache_file_path):
+            with open(cache_file_path, "r", encoding="utf-8") as f:
+                cached = json.load(f, object_hook=enum_keys_object_hook)
+            if (cached.get("version") == self.properties_cache_version
+                    and cached.get("source_hash") == source_hash):
+                return cached["properties"]
+        properties = self.get_available_properties()
+        with atomic_open(cache_file_path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.properties_cache_version, "source_hash": source_hash,
+                       "properties": properties}, f, ensure_ascii=False)
         return properties
 
 
@@ -343,11 +525,16 @@ class GridGenerator:
         catalog = self.get_or_create_catalog(catalog_name)
 
         channels: list[Channel] = catalog['channels']
+        # le catalogue n'est réécrit que s'il a été modifié
+        dirty = False
 
         if catalog['step'] < CatalogGenerationStep.generation:
             if catalog_template == "random":
+                # propriétés du catalogue calculées une fois pour toutes les chaînes
+                available_props = ShowAnalyzer(shows_list).get_cached_available_properties(
+                    show_retriever.show_file_path)
                 for i in range(channel_count):
-                    created_channel = self.generate_random_channel(shows_list)
+                    created_channel = self.generate_random_channel(shows_list, available_props)
                     channels.append(created_channel)
             else:
                 catalog = self.get_or_create_catalog(catalog_name=catalog_template, is_template=True)
@@ -356,28 +543,40 @@ class GridGenerator:
 
             catalog['step'] = CatalogGenerationStep.generation
             catalog['channels'] = channels
-            self.save_catalog(catalog)
+            dirty = True
 
         for channel in catalog['channels']:
-            channel['fillers'] = self.replace_super_categories(channel['fillers'])
+            dirty |= self.apply_super_categories(channel, 'fillers')
             for block in channel['blocks']:
                 for criteria in block['criteria']:
                     if criteria['category'] == CategoryCriteria.GENRE:
-                        criteria['values'] = self.replace_super_categories(criteria['values'])
+                        dirty |= self.apply_super_categories(criteria, 'values')
 
-        self.save_catalog(catalog)
+        if dirty:
+            self.save_catalog(catalog)
 
         if catalog['step'] < CatalogGenerationStep.config:
+            # même liste de shows pour toutes les chaînes : un seul index
+            show_index = ShowSelector.index_shows(shows_list)
             for channel in channels:
                 if "name" not in channel:
                     channel['name'] = self.generate_channel_name(channel)
-                show_selector = ShowSelector(channel=channel, show_list=shows_list)
+                show_selector = ShowSelector(channel=channel, show_list=shows_list, show_index=show_index)
                 show_selector.generate_schedules()
             catalog['step'] = CatalogGenerationStep.config
             catalog['step'] = 0
             self.save_catalog(catalog)
         return catalog
 
+    def apply_super_categories(self, container: dict, key: str) -> bool:
+        # remplace les super-catégories de container[key] ; faux si les valeurs sont inchangées
+        values = container[key]
+        replaced = self.replace_super_categories(values)
+        if len(replaced) == len(values) and set(replaced) == set(values):
+            return False
+        container[key] = replaced
+        return True
+
     @staticmethod
     def replace_super_categories(categories: list[str]) -> list[str]:
         result = set()
@@ -390,16 +589,21 @@ class GridGenerator:
 
     def get_or_create_catalog(self, catalog_name: str, is_template=False) -> Catalog:
         if os.path.exists(self.get_catalog_json(catalog_name, is_template=is_template)):
-            with open(self.get_catalog_json(catalog_name, is_template=is_template), "r", encoding="utf-8") as f:
-                loaded_data = json.load(f)
-            catalog = deserialize_enum_keys(loaded_data)
+            if orjson is not None:
+                with open(self.get_catalog_json(catalog_name, is_template=is_template), "rb") as f:
+                    catalog = deserialize_enum_keys(orjson.loads(f.read()))
+            else:
+                with open(self.get_catalog_json(catalog_name, is_template=is_template), "r", encoding="utf-8") as f:
+                    catalog = json.load(f, object_hook=enum_keys_object_hook)
         else:
             catalog: Catalog = {'name': catalog_name, 'step': 0, 'channels': []}
         return catalog
 
     @staticmethod
-    def generate_random_channel(shows_list: list[Show]) -> Channel:
-        available_props = ShowAnalyzer(shows_list).get_available_properties()
+    def generate_random_channel(shows_list: list[Show],
+                                available_props: dict[CategoryCriteria, list[str | int | float]] = None) -> Channel:
+        if available_props is None:
+            available_props = ShowAnalyzer(shows_list).get_available_properties()
 
         channel_maker = ChannelMaker(available_properties=available_props)
         channel_maker.make_channel_frame()
@@ -414,79 +618,176 @@ class GridGenerator:
         return ""
 
     def save_catalog(self, catalog: Catalog):
-        with open(self.get_catalog_json(catalog['name']), "w", encoding="utf-8", ) as f:
-            json.dump(catalog, f, indent=4, ensure_ascii=False)
+        # le catalogue reste indenté comme les templates (2 espaces, seule indentation
+        # d'orjson) : il est relu et retouché à la main, au même format avec ou sans orjson
+        if orjson is not None:
+            with atomic_open(self.get_catalog_json(catalog['name']), "wb") as f:
+                f.write(orjson.dumps(catalog, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with atomic_open(self.get_catalog_json(catalog['name']), "w", encoding="utf-8", ) as f:
+                json.dump(catalog, f, indent=2, ensure_ascii=False)
 
 
 class PlayoutGenerator:
+    # environnement partagé : le template est compilé au premier rendu puis gardé en cache
+    template_env = jinja2.Environment(loader=jinja2.FileSystemLoader('.'), auto_reload=False, cache_size=-1)
+    template_env.globals['hour_float_to_hour_minute'] = hour_float_to_hour_minute
+    template_file = os.path.join(DATA_DIR, "playout_template.txt")
 
     def __init__(self, channel: Channel):
         self.channel = channel
 
     def generate_playout(self):
-        template_file = os.path.join(DATA_DIR, "playout_template.txt")
-        env = jinja2.Environment(loader=jinja2.FileSystemLoader('.'))
-        env.globals['hour_float_to_hour_minute'] = hour_float_to_hour_minute
-        template = env.get_template(template_file)
-        output = template.render(channel=self.channel)
+        template = self.template_env.get_template(self.template_file)
         file_path = os.path.join(PLAYOUT_DIR, f'{self.channel["name"]}.yaml')
+        # rendu écrit au fil de l'eau plutôt que construit en entier en mémoire
         with open(file_path, 'w') as f:
-            f.write(output)
+            template.stream(channel=self.channel).dump(f)
 
 
 class ErsatzTvApi:
+    # délai max (ms) d'attente d'un état de l'interface après une action
+    wait_timeout = 10000
+    # pas de rendu GPU ni de /dev/shm (limité dans les conteneurs) en headless
+    launch_args = ["--disable-gpu", "--disable-dev-shm-usage"]
 
-    def __init__(self):
+    def __init__(self, browser=None):
         self.url = settings.ERSATZ_URL
+        # navigateur déjà lancé, fourni par l'appelant ou par `with ErsatzTvApi() as api`,
+        # pour éviter un démarrage par opération
+        self.browser = browser
+        self._playwright = None
+        # ErsatzTV propose le prochain numéro libre à l'ouverture du formulaire :
+        # les créations de chaînes restent donc séquentielles
+        self._channel_lock = threading.Lock()
+
+    def __enter__(self):
+        if self.browser is None:
+            self._playwright = sync_playwright().start()
+            self.browser = self._playwright.chromium.launch(headless=True, args=self.launch_args)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._playwright is not None:
+            self.browser.close()
+            self._playwright.stop()
+            self.browser = self._playwright = None
+
+    def configura_channel(self, channel: Channel, browser=None):
+        # une seule session navigateur pour la chaîne et son playout
+        with self._new_page(browser) as page:
+            with self._channel_lock:
+                self._create_channel(page, channel)
+            self._create_yml_playout(page, channel)
+
+    def configure_channels(self, channels: list[Channel], workers=4):
+        # L'API sync de Playwright est liée à son thread : chaque worker lance son
+        # propre navigateur, une seule fois pour toutes ses chaînes.
+        # Une erreur n'interrompt pas les autres chaînes.
+        def configure(channel: Channel, browser=None):
+            try:
+                self.configura_channel(channel, browser)
+            except Exception as e:
+                print(str(e))
+
+        if self.browser is not None:
+            # un navigateur fourni n'est utilisable que depuis le thread qui l'a lancé
+            for channel in channels:
+                configure(channel)
+            return
 
-    def configura_channel(self, channel: Channel):
-        self.create_channel(channel)
-        self.create_yml_playout(channel)
+        def configure_batch(batch: list[Channel]):
+            with self._launch_browser() as browser:
+                for channel in batch:
+                    configure(channel, browser)
 
-    def create_channel(self, channel: Channel):
+        workers = max(1, min(workers, len(channels)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(configure_batch, [channels[i::workers] for i in range(workers)]))
+
+    @contextmanager
+    def _launch_browser(self):
         with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context()
-            page = context.new_page()
-            page.goto(f"{self.url}/channels/add")
-            page.get_by_role("group").filter(has_text="Name").get_by_role("textbox").fill(channel['name'])
-            time.sleep(1)
-            logo_file_path = os.path.join(DATA_DIR, "logo", channel['logo']) if "logo" in channel else os.path.join(
-                DATA_DIR, "logo", f"{channel['name']}.png")
-            if os.path.exists(logo_file_path):
-                page.set_input_files("#fileInput", logo_file_path)
-                time.sleep(2)
-
-            page.get_by_role("button", name="Add Channel").click()
-            time.sleep(5)
+            browser = p.chromium.launch(headless=True, args=self.launch_args)
+            try:
+                yield browser
+            finally:
+                browser.close()
+
+    @contextmanager
+    def _new_page(self, browser=None):
+        browser = browser or self.browser
+        if browser is None:
+            with self._launch_browser() as launched, self._new_page(launched) as page:
+                yield page
+            return
+        context = browser.new_context()
+        context.set_default_timeout(self.wait_timeout)
+        try:
+            yield context.new_page()
+        finally:
+            context.close()
+
+    def _wait_ready(self, locator):
+        # expect réessaie jusqu'à l'état attendu et rend la main dès qu'il est atteint
+        expect(locator).to_be_visible(timeout=self.wait_timeout)
+        return locator
+
+    def _wait_confirmation(self, locator, description: str):
+        # confirmation d'une action dont le rendu n'a pas été relevé sur ErsatzTV : un
+        # dépassement est signalé sans interrompre la configuration
+        try:
+            expect(locator).to_be_visible(timeout=self.wait_timeout)
+        except AssertionError:
+            write_log(f"{description} not confirmed after {self.wait_timeout} ms")
+
+    @staticmethod
+    def _channel_row(page, channel: Channel):
+        return page.get_by_role(
+            "row",
+            name=re.compile(rf"\d+\s+{re.escape(channel['name'])}", re.IGNORECASE)
+        )
+
+    def create_channel(self, channel: Channel):
+        with self._new_page() as page:
+            self._create_channel(page, channel)
+
+    def _create_channel(self, page, channel: Channel):
+        page.goto(f"{self.url}/channels/add")
+        page.get_by_role("group").filter(has_text="Name").get_by_role("textbox").fill(channel['name'])
+        logo_file_path = os.path.join(DATA_DIR, "logo", channel['logo']) if "logo" in channel else os.path.join(
+            DATA_DIR, "logo", f"{channel['name']}.png")
+        if os.path.exists(logo_file_path):
+            page.set_input_files("#fileInput", logo_file_path)
+            # l'envoi passe par le websocket Blazor, sans requête HTTP à attendre : l'aperçu
+            # du logo n'apparaît qu'une fois le fichier enregistré par ErsatzTV
+            self._wait_confirmation(page.locator("img[src*='logos/']").first, f"{channel['name']} logo upload")
+
+        page.get_by_role("button", name="Add Channel").click()
+        # la chaîne enregistrée apparaît dans la liste des chaînes
+        self._wait_confirmation(self._channel_row(page, channel), f"{channel['name']} channel creation")
 
     def create_yml_playout(self, channel: Channel):
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context()
-            page = context.new_page()
-            page.goto(f"{self.url}/playouts/add/yaml")
-            page.get_by_text("Channel Disabled channels").click()
-            page.get_by_text(f"- {channel['name']}").click()
-            yml_path = os.path.join(ERSATZTV_PLAYOUT_DIR, f"{channel['name']}.yaml")
-            page.get_by_role("group").filter(has_text="YAML File").locator("input").first.fill(yml_path)
-            time.sleep(1)
-            page.get_by_role("button", name="Add YAML Playout").click()
-            time.sleep(3)
+        with self._new_page() as page:
+            self._create_yml_playout(page, channel)
+
+    def _create_yml_playout(self, page, channel: Channel):
+        page.goto(f"{self.url}/playouts/add/yaml")
+        page.get_by_text("Channel Disabled channels").click()
+        self._wait_ready(page.get_by_text(f"- {channel['name']}")).click()
+        yml_path = os.path.join(ERSATZTV_PLAYOUT_DIR, f"{channel['name']}.yaml")
+        page.get_by_role("group").filter(has_text="YAML File").locator("input").first.fill(yml_path)
+        page.get_by_role("button", name="Add YAML Playout").click()
+        self._wait_confirmation(page.get_by_role("row").filter(has_text=channel['name']).first,
+                                f"{channel['name']} playout creation")
 
     def delete_channel(self, channel: Channel):
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context()
-            page = context.new_page()
+        with self._new_page() as page:
             page.goto(f"{self.url}/channels")
-            page.get_by_role(
-                "row",
-                name=re.compile(rf"\d+\s+{channel['name']}", re.IGNORECASE)
-            ).get_by_role("button").nth(1).click()
-            time.sleep(1)
-            page.get_by_role("button", name="Delete").click()
-            time.sleep(1)
+            row = self._channel_row(page, channel)
+            row.get_by_role("button").nth(1).click()
+            self._wait_ready(page.get_by_role("button", name="Delete")).click()
+            expect(row).to_be_hidden(timeout=self.wait_timeout)
 
 
 def ensure_base_directories():
@@ -508,14 +809,12 @@ if __name__ == '__main__':
         write_log("Initialisation")
         write_log("Generating playout yml...")
         PlayoutGenerator(catalog_channel).generate_playout()
-        write_log("Ersatz configuration")
-        try:
-            ErsatzTvApi().configura_channel(catalog_channel)
-        except Exception as e:
-            print(str(e))
-        # try:
-        #     ErsatzTvApi().delete_channel(catalog_channel)
-        # except Exception:
-        #     pass
-        write_log("Complete")
         write_log(f"-----")
+    write_log("Ersatz configuration")
+    ErsatzTvApi().configure_channels(generate_catalog['channels'])
+    # for catalog_channel in generate_catalog['channels']:
+    #     try:
+    #         ErsatzTvApi().delete_channel(catalog_channel)
+    #     except Exception:
+    #         pass
+    write_log("Complete")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_caches.py
+--------------
+
+Tests des fichiers de cache écrits sur disque : le cache des propriétés
+disponibles (`ShowAnalyzer.get_cached_available_properties`) et l'écriture
+atomique (`utils.atomic_open`) sur laquelle reposent les caches et les
+catalogues.
+
+Pour exécuter les tests manuellement, lancez :
+
+    python test_caches.py
+
+Chaque test travaille dans un dossier temporaire ; le dossier `data` du
+projet n'est jamais modifié.
+"""
+
+import json
+import os
+import stat
+import tempfile
+
+import grid_generator
+from data_types import CategoryCriteria
+from grid_generator import ShowAnalyzer
+from utils import atomic_open
+
+
+def example_shows(genre: str) -> list:
+    """Construit une liste de shows minimale.
+
+    Args:
+        genre: Genre porté par l'unique show.
+
+    Returns:
+        Une liste d'un show, au format du cache Jellyfin.
+    """
+    return [{
+        "name": "Show Test",
+        "properties": {
+            CategoryCriteria.GENRE: [genre],
+            CategoryCriteria.DURATION: [None, None],
+        },
+    }]
+
+
+def write_shows(path: str, shows: list) -> None:
+    """Écrit un cache de shows comme le ferait `JellyfinShowRetriever.save_shows`."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(shows, f, ensure_ascii=False)
+
+
+def open_fd_count() -> int:
+    """Nombre de descripteurs ouverts par le processus (-1 hors Linux)."""
+    if not os.path.isdir("/proc/self/fd"):
+        return -1
+    return len(os.listdir("/proc/self/fd"))
+
+
+def test_available_properties_cache(data_dir: str) -> None:
+    """Succès, changement de version et changement de shows.json pour le cache des propriétés."""
+    shows_path = os.path.join(data_dir, "shows.json")
+    cache_path = os.path.join(data_dir, "available_properties.json")
+    write_shows(shows_path, example_shows("Action"))
+
+    print("Test 1 : premier appel puis réutilisation du cache")
+    props = ShowAnalyzer(example_shows("Action")).get_cached_available_properties(shows_path)
+    assert props[CategoryCriteria.GENRE] == ["Action"]
+    assert props[CategoryCriteria.DURATION] == [], "Les durées inconnues ne sont pas proposées"
+    assert os.path.exists(cache_path)
+    # shows.json inchangé : le cache est relu, les shows de l'analyseur ne sont pas consultés
+    cached = ShowAnalyzer(example_shows("Drame")).get_cached_available_properties(shows_path)
+    assert cached[CategoryCriteria.GENRE] == ["Action"], "Le cache doit être réutilisé"
+    print("→ OK")
+    print()
+
+    print("Test 2 : version du cache différente")
+    with open(cache_path, "r", encoding="utf-8") as f:
+        stored = json.load(f)
+    stored["version"] = ShowAnalyzer.properties_cache_version - 1
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump(stored, f)
+    props = ShowAnalyzer(example_shows("Drame")).get_cached_available_properties(shows_path)
+    assert props[CategoryCriteria.GENRE] == ["Drame"], "Un cache d'une autre version doit être recalculé"
+    with open(cache_path, "r", encoding="utf-8") as f:
+        assert json.load(f)["version"] == ShowAnalyzer.properties_cache_version
+    # un cache sans version (écrit avant son introduction) est lui aussi écarté
+    del stored["version"]
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump(stored, f)
+    props = ShowAnalyzer(example_shows("Western")).get_cached_available_properties(shows_path)
+    assert props[CategoryCriteria.GENRE] == ["Western"]
+    print("→ OK")
+    print()
+
+    print("Test 3 : shows.json modifié")
+    write_shows(shows_path, example_shows("Crime"))
+    props = ShowAnalyzer(example_shows("Crime")).get_cached_available_properties(shows_path)
+    assert props[CategoryCriteria.GENRE] == ["Crime"], "Un nouveau shows.json doit invalider le cache"
+    print("→ OK")
+    print()
+
+
+def test_atomic_open(data_dir: str) -> None:
+    """Remplacement, échec d'écriture et échec d'ouverture pour `atomic_open`."""
+    path = os.path.join(data_dir, "catalog.json")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("ancien")
+    os.chmod(path, 0o600)
+
+    print("Test 4 : écriture complète")
+    with atomic_open(path, "w", encoding="utf-8") as f:
+        f.write("nouveau")
+    with open(path, "r", encoding="utf-8") as f:
+        assert f.read() == "nouveau"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600, "Les droits du fichier remplacé sont conservés"
+    assert os.listdir(data_dir) == ["catalog.json"], "Aucun fichier temporaire ne doit rester"
+    print("→ OK")
+    print()
+
+    print("Test 5 : erreur pendant l'écriture")
+    try:
+        with atomic_open(path, "w", encoding="utf-8") as f:
+            f.write("tronqué")
+            raise RuntimeError("interruption")
+    except RuntimeError:
+        pass
+    with open(path, "r", encoding="utf-8") as f:
+        assert f.read() == "nouveau", "Le fichier existant doit rester intact"
+    assert os.listdir(data_dir) == ["catalog.json"]
+    print("→ OK")
+    print()
+
+    print("Test 6 : ouverture refusée (encodage ou mode invalide)")
+    fd_count = open_fd_count()
+    for mode, kwargs, expected in (
+        ("w", {"encoding": "encodage-inconnu"}, LookupError),
+        ("zz", {}, ValueError),
+        ("wb", {"encoding": "utf-8"}, ValueError),
+    ):
+        try:
+            with atomic_open(path, mode, **kwargs):
+                raise AssertionError("atomic_open ne doit pas rendre la main")
+        except expected:
+            pass
+        assert os.listdir(data_dir) == ["catalog.json"], f"Fichier temporaire laissé pour {mode!r} {kwargs}"
+    assert open_fd_count() == fd_count, "Le descripteur du fichier temporaire doit être fermé"
+    with open(path, "r", encoding="utf-8") as f:
+        assert f.read() == "nouveau"
+    print("→ OK")
+
+
+def run_tests() -> None:
+    """Exécute les tests dans des dossiers temporaires."""
+    data_dir = grid_generator.DATA_DIR
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            grid_generator.DATA_DIR = tmp
+            test_available_properties_cache(tmp)
+        with tempfile.TemporaryDirectory() as tmp:
+            test_atomic_open(tmp)
+    finally:
+        grid_generator.DATA_DIR = data_dir
+
+
+if __name__ == "__main__":  # pragma: no cover
+    run_tests()
@@ -1,5 +1,10 @@
-from datetime import datetime, timedelta
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from datetime import timedelta
 from enum import Enum
+from functools import lru_cache
 
 from data_types import CategoryCriteria
 
@@ -15,23 +20,77 @@ def serialize_enum_keys(obj):
         return obj
 
 
+_CATEGORY_BY_VALUE = {category.value: category for category in CategoryCriteria}
+
+
 def deserialize_enum_keys(obj):
-    if isinstance(obj, dict):
-        new_obj = {}
-        for k, v in obj.items():
-            try:
-                enum_key = CategoryCriteria(k)
-            except ValueError:
-                enum_key = k  # Garde la clé si ce n'est pas une enum
-            new_obj[enum_key] = deserialize_enum_keys(v)
-        return new_obj
-    elif isinstance(obj, list):
-        return [deserialize_enum_keys(i) for i in obj]
-    else:
+    if not isinstance(obj, (dict, list)):
         return obj
+    # parcours itératif : chaque conteneur est recopié dans `target`, ses sous-conteneurs
+    # sont empilés au lieu d'un appel récursif par valeur
+    get_key = _CATEGORY_BY_VALUE.get
+    root = {} if isinstance(obj, dict) else []
+    stack = [(root, obj)]
+    while stack:
+        target, source = stack.pop()
+        if isinstance(source, dict):
+            for k, v in source.items():
+                if isinstance(v, dict):
+                    v_copy = {}
+                    stack.append((v_copy, v))
+                elif isinstance(v, list):
+                    v_copy = []
+                    stack.append((v_copy, v))
+                else:
+                    v_copy = v
+                # Garde la clé si ce n'est pas une enum
+                target[get_key(k, k)] = v_copy
+        else:
+            for v in source:
+                if isinstance(v, dict):
+                    v_copy = {}
+                    stack.append((v_copy, v))
+                elif isinstance(v, list):
+                    v_copy = []
+                    stack.append((v_copy, v))
+                else:
+                    v_copy = v
+                target.append(v_copy)
+    return root
 
 
+def enum_keys_object_hook(obj: dict) -> dict:
+    # à passer en object_hook de json.load(s) : même conversion que deserialize_enum_keys,
+    # faite pendant le parsing plutôt que par un second parcours
+    return {_CATEGORY_BY_VALUE.get(k, k): v for k, v in obj.items()}
+
+
+@lru_cache(maxsize=1024)
 def hour_float_to_hour_minute(hour):
-    base = datetime.strptime("00:00", "%H:%M")
-    result = base + timedelta(hours=hour)
-    return result.strftime("%I:%M %p")
+    # minutes entières depuis minuit, tronquées comme le faisait strftime ; timedelta
+    # garde l'arrondi à la microseconde de l'ancien calcul par datetime
+    delta = timedelta(hours=hour)
+    hours, minutes = divmod((delta.days * 1440 + delta.seconds // 60) % 1440, 60)
+    return f"{hours % 12 or 12:02d}:{minutes:02d} {'AM' if hours < 12 else 'PM'}"
+
+
+@contextmanager
+def atomic_open(path, mode="w", **kwargs):
+    # écriture dans un fichier temporaire du même dossier, substitué à `path` une fois
+    # complet : une écriture interrompue ne laisse jamais de fichier tronqué
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".", suffix=".tmp")
+    try:
+        # closefd=False : le descripteur est toujours fermé ici, une seule fois, même
+        # quand os.fdopen échoue (mode ou encodage refusé)
+        try:
+            with os.fdopen(fd, mode, closefd=False, **kwargs) as f:
+                yield f
+        finally:
+            os.close(fd)
+        # mkstemp crée le fichier en 0600 : on garde les droits du fichier remplacé
+        mode_bits = stat.S_IMODE(os.stat(path).st_mode) if os.path.exists(path) else 0o644
+        os.chmod(tmp_path, mode_bits)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise